@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from api.utils.snapshots import export_snapshots
+
+
+class Command(BaseCommand):
+    help = "Export the public posts as pre-compressed JSON snapshots."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Rewrite every snapshot instead of only the changed ones.",
+        )
+
+    def handle(self, *args, **options):
+        stats = export_snapshots(full=options["full"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Wrote {stats['written']} snapshots, {stats['unchanged']} unchanged, "
+                f"{stats['removed']} removed."
+            )
+        )
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from api.utils.related import refresh_related_posts
+
+
+class Command(BaseCommand):
+    help = "Recompute the related posts of every published post."
+
+    def handle(self, *args, **options):
+        count = refresh_related_posts()
+        self.stdout.write(
+            self.style.SUCCESS(f"Computed related posts for {count} posts.")
+        )
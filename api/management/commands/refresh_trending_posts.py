@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from api.utils.trending import refresh_trending
+
+
+class Command(BaseCommand):
+    help = "Recompute the trending posts ranking from the hourly view counts."
+
+    def handle(self, *args, **options):
+        ranking = refresh_trending()
+        self.stdout.write(self.style.SUCCESS(f"Ranked {len(ranking)} trending posts."))
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.1 on 2026-10-17 09:12
+
+from django.db import migrations
+
+from api.utils.search import create_index, drop_index, rebuild_index
+
+
+def build_index(apps, schema_editor):
+    create_index(schema_editor)
+    rebuild_index()
+
+
+def remove_index(apps, schema_editor):
+    drop_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0057_invoice_donation_id"),
+    ]
+
+    operations = [
+        migrations.RunPython(build_index, remove_index),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 4.2.1 on 2026-10-17 09:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from api.utils.tags import tag_slugs
+
+
+def index_tags(apps, schema_editor):
+    Post = apps.get_model("api", "Post")
+    PostTag = apps.get_model("api", "PostTag")
+
+    PostTag.objects.bulk_create(
+        [
+            PostTag(post_id=post_id, slug=slug, name=name)
+            for post_id, tags in Post.objects.values_list("id", "tags").iterator()
+            for slug, name in tag_slugs(tags).items()
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0058_post_search_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PostTag",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("slug", models.SlugField(max_length=150)),
+                ("name", models.CharField(max_length=150)),
+                (
+                    "post",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="post_tags",
+                        to="api.post",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["slug", "post"], name="api_posttag_slug_7bbe42_idx"
+                    )
+                ],
+                "unique_together": {("post", "slug")},
+            },
+        ),
+        migrations.RunPython(index_tags, migrations.RunPython.noop),
+    ]
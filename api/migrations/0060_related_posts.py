@@ -0,0 +1,52 @@
+# Generated by Django 4.2.1 on 2026-10-17 10:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0059_post_tags"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RelatedPost",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("score", models.FloatField()),
+                (
+                    "post",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="related_posts",
+                        to="api.post",
+                    ),
+                ),
+                (
+                    "related",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="related_from",
+                        to="api.post",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["post", "-score"], name="api_related_post_id_ad3460_idx"
+                    )
+                ],
+                "unique_together": {("post", "related")},
+            },
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 4.2.1 on 2026-10-17 10:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from api.utils.files import extract_files
+
+
+def index_files(apps, schema_editor):
+    Post = apps.get_model("api", "Post")
+    PostFile = apps.get_model("api", "PostFile")
+
+    PostFile.objects.bulk_create(
+        [
+            PostFile(post_id=post_id, file_id=file_id, position=position, data=entry)
+            for post_id, files in Post.objects.values_list("id", "files").iterator()
+            for position, (file_id, entry) in enumerate(extract_files(files).items())
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0060_related_posts"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PostFile",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("file_id", models.CharField(db_index=True, max_length=150)),
+                ("position", models.PositiveIntegerField(default=0)),
+                ("data", models.JSONField(default=dict)),
+                (
+                    "post",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="post_files",
+                        to="api.post",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["post", "position"],
+                        name="api_postfil_post_id_b9cb35_idx",
+                    )
+                ],
+                "unique_together": {("post", "file_id")},
+            },
+        ),
+        migrations.RunPython(index_files, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,117 @@
+# Generated by Django 4.2.1 on 2026-10-17 11:10
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def import_attendees(apps, schema_editor):
+    """
+    Move the attendees stored in Post.attendees that carry an email into RSVP
+    rows and count them.
+    """
+    Post = apps.get_model("api", "Post")
+    RSVP = apps.get_model("api", "RSVP")
+
+    for post in Post.objects.exclude(attendees={}).only("id", "attendees").iterator():
+        attendees = post.attendees
+        if isinstance(attendees, dict):
+            attendees = attendees.get("data", [])
+        if not isinstance(attendees, list):
+            continue
+
+        rsvps = {}
+        for attendee in attendees:
+            if isinstance(attendee, dict) and attendee.get("email"):
+                email = str(attendee["email"]).strip().lower()
+                rsvps.setdefault(
+                    email,
+                    RSVP(
+                        post_id=post.id,
+                        email=email,
+                        name=str(attendee.get("name", ""))[:300],
+                        phone_number=str(attendee.get("phone_number", ""))[:300],
+                    ),
+                )
+
+        RSVP.objects.bulk_create(rsvps.values())
+        Post.objects.filter(pk=post.id).update(attendee_count=len(rsvps))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0061_post_files"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RSVP",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=300)),
+                ("email", models.EmailField(max_length=254)),
+                ("phone_number", models.CharField(blank=True, max_length=300)),
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="attendee_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="capacity",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name="post",
+            constraint=models.CheckConstraint(
+                check=models.Q(
+                    ("capacity__isnull", True),
+                    ("attendee_count__lte", models.F("capacity")),
+                    _connector="OR",
+                ),
+                name="post_attendees_within_capacity",
+            ),
+        ),
+        migrations.AddField(
+            model_name="rsvp",
+            name="member",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="rsvps",
+                to="api.member",
+            ),
+        ),
+        migrations.AddField(
+            model_name="rsvp",
+            name="post",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="rsvps",
+                to="api.post",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="rsvp",
+            index=models.Index(
+                fields=["post", "created_at", "id"], name="api_rsvp_post_id_b5a09f_idx"
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="rsvp",
+            unique_together={("post", "email")},
+        ),
+        migrations.RunPython(import_attendees, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 4.2.1 on 2026-10-17 11:50
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0062_event_rsvps"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PostRevision",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("number", models.PositiveIntegerField()),
+                ("diff", models.BinaryField()),
+                ("size", models.PositiveIntegerField(default=0)),
+                ("changed_fields", models.JSONField(default=list)),
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now)),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="post_revisions",
+                        to="api.administrator",
+                    ),
+                ),
+                (
+                    "post",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="revisions",
+                        to="api.post",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("post", "number")},
+            },
+        ),
+    ]
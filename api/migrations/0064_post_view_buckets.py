@@ -0,0 +1,43 @@
+# Generated by Django 4.2.1 on 2026-10-17 12:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0063_post_revisions"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PostViewBucket",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("hour", models.DateTimeField()),
+                ("views", models.PositiveIntegerField(default=0)),
+                (
+                    "post",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="view_buckets",
+                        to="api.post",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["hour"], name="api_postvie_hour_bf340c_idx")
+                ],
+                "unique_together": {("post", "hour")},
+            },
+        ),
+    ]
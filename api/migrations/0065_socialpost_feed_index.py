@@ -0,0 +1,19 @@
+# Generated by Django 4.2.1 on 2026-10-17 12:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0064_post_view_buckets"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="socialpost",
+            index=models.Index(
+                fields=["status", "-created_at", "-id"],
+                name="api_socialp_status_48de45_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.1 on 2026-10-17 13:10
+
+from django.db import migrations
+from django.db.models import F, OuterRef, Subquery, Value
+from django.db.models.functions import Concat, Left
+
+
+def fill_authors(apps, schema_editor):
+    Member = apps.get_model("api", "Member")
+    SocialPost = apps.get_model("api", "SocialPost")
+    Comment = apps.get_model("api", "Comment")
+
+    def member_value(model, column, expression):
+        # Member values can be longer than the columns they are copied to
+        length = model._meta.get_field(column).max_length
+        return Subquery(
+            Member.objects.filter(pk=OuterRef("created_by_id"))
+            .annotate(value=Left(expression, length))
+            .values("value")[:1]
+        )
+
+    name = Concat("first_name", Value(" "), "last_name")
+    SocialPost.objects.filter(created_by__isnull=False).update(
+        author=member_value(SocialPost, "author", name),
+        company=member_value(SocialPost, "company", F("company")),
+        logo=member_value(SocialPost, "logo", F("logo")),
+    )
+    Comment.objects.filter(created_by__isnull=False).update(
+        author=member_value(Comment, "author", name),
+        company=member_value(Comment, "company", F("company")),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0065_socialpost_feed_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_authors, migrations.RunPython.noop),
+    ]
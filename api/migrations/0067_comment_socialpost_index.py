@@ -0,0 +1,19 @@
+# Generated by Django 4.2.1 on 2026-10-17 13:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0066_author_snapshots"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["socialpost", "-created_at", "-id"],
+                name="api_comment_socialp_da6095_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,96 @@
+# Generated by Django 4.2.1 on 2026-10-17 14:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+from collections import Counter
+
+
+def import_likes(apps, schema_editor):
+    """
+    Move the socialpost IDs stored in Member.likes into Like rows, and raise
+    the likes counter of every socialpost to at least its number of rows.
+    """
+    Like = apps.get_model("api", "Like")
+    Member = apps.get_model("api", "Member")
+    SocialPost = apps.get_model("api", "SocialPost")
+
+    existing = set(SocialPost.objects.values_list("id", flat=True))
+    counts = Counter()
+    for member in Member.objects.only("id", "likes").iterator():
+        liked = member.likes
+        if isinstance(liked, dict):
+            liked = liked.get("data", [])
+        if not isinstance(liked, list):
+            continue
+
+        socialpost_ids = set()
+        for item in liked:
+            if isinstance(item, dict):
+                item = item.get("id")
+            try:
+                socialpost_ids.add(int(item))
+            except (TypeError, ValueError):
+                continue
+
+        socialpost_ids &= existing
+        Like.objects.bulk_create(
+            [
+                Like(member_id=member.id, socialpost_id=socialpost_id)
+                for socialpost_id in socialpost_ids
+            ]
+        )
+        counts.update(socialpost_ids)
+
+    for socialpost_id, count in counts.items():
+        SocialPost.objects.filter(pk=socialpost_id, likes__lt=count).update(likes=count)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0067_comment_socialpost_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Like",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now)),
+                (
+                    "member",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="socialpost_likes",
+                        to="api.member",
+                    ),
+                ),
+                (
+                    "socialpost",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="socialpost_likes",
+                        to="api.socialpost",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("member", "socialpost")},
+            },
+        ),
+        migrations.RunPython(import_likes, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name="member",
+            name="likes",
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.1 on 2026-10-17 15:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0068_likes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="socialpost",
+            index=models.Index(
+                fields=["created_by", "-created_at", "-id"],
+                name="api_socialp_created_e9c5c4_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.1 on 2026-10-17 16:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0069_socialpost_member_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="postrevision",
+            name="checksums",
+            field=models.JSONField(default=dict),
+        ),
+    ]
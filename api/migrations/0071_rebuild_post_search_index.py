@@ -0,0 +1,20 @@
+# Generated by Django 4.2.1 on 2026-10-17 16:45
+
+from django.db import migrations
+
+from api.utils.search import rebuild_index
+
+
+def reindex(apps, schema_editor):
+    # Post content is indexed as text instead of HTML
+    rebuild_index()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0070_postrevision_checksums"),
+    ]
+
+    operations = [
+        migrations.RunPython(reindex, migrations.RunPython.noop),
+    ]
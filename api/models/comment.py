@@ -25,3 +25,6 @@ class Comment(models.Model):
     )
     created_at = models.DateTimeField(default=timezone.now)
     last_updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["socialpost", "-created_at", "-id"])]
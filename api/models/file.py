@@ -0,0 +1,18 @@
+from django.db import models
+from api.models.post import Post
+
+
+class PostFile(models.Model):
+    """
+    A schema for the files attached to posts.
+    Holds one row per uploaded file, kept in step with Post.files.
+    """
+
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="post_files")
+    file_id = models.CharField(max_length=150, db_index=True)
+    position = models.PositiveIntegerField(default=0)
+    data = models.JSONField(default=dict)
+
+    class Meta:
+        unique_together = [["post", "file_id"]]
+        indexes = [models.Index(fields=["post", "position"])]
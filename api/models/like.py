@@ -0,0 +1,26 @@
+from django.db import models
+from django.utils import timezone
+from api.models.member import Member
+from api.models.socialpost import SocialPost
+
+
+class Like(models.Model):
+    """
+    A schema for likes on social posts.
+    Holds one row per member and liked socialpost, counted in SocialPost.likes.
+    """
+
+    member = models.ForeignKey(
+        Member,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="socialpost_likes",
+    )
+    socialpost = models.ForeignKey(
+        SocialPost, on_delete=models.CASCADE, related_name="socialpost_likes"
+    )
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = [["member", "socialpost"]]
@@ -2,6 +2,7 @@ import datetime
 
 from django.db import models
 from django.utils import timezone
+from api.utils.authors import AUTHOR_FIELDS, schedule_author_propagation
 
 
 class Member(models.Model):
@@ -26,7 +27,6 @@ class Member(models.Model):
     website_link = models.CharField(max_length=300, blank=True)
     logo = models.CharField(max_length=300, default="default.png")
     bookmarks = models.JSONField(default=dict)
-    likes = models.JSONField(default=dict)
     registration_status = models.CharField(max_length=150, default="unregistered")
     subscription_status = models.CharField(max_length=150, default="inactive")
     subscription_category = models.CharField(max_length=300, blank=True)
@@ -39,3 +39,19 @@ class Member(models.Model):
     created_by = models.IntegerField(default=1)
     created_at = models.DateTimeField(default=timezone.now)
     last_updated = models.DateTimeField(auto_now=True)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        previous = None
+        if not self._state.adding and (
+            update_fields is None or set(update_fields) & set(AUTHOR_FIELDS)
+        ):
+            previous = Member.objects.filter(pk=self.pk).values(*AUTHOR_FIELDS).first()
+
+        super().save(*args, **kwargs)
+
+        # Keep the author details stored on the member's content up to date
+        if previous and any(
+            previous[field] != getattr(self, field) for field in AUTHOR_FIELDS
+        ):
+            schedule_author_propagation(self.pk)
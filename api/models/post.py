@@ -1,6 +1,24 @@
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 from api.models.administrator import Administrator
+from api.utils.locks import select_for_update
+from api.utils.revisions import REVISION_FIELDS, record_revision
+from api.utils.search import INDEXED_FIELDS, index_post, unindex_posts
+from api.utils.files import sync_post_files
+from api.utils.tags import sync_post_tags
+
+COUNTER_FIELDS = ["views", "attendee_count"]
+
+
+class PostQuerySet(models.QuerySet):
+    def public(self):
+        """
+        Restrict to the posts visitors can see: public, published and past
+        their publication date.
+        """
+        return self.filter(
+            access="public", status="published", published__lt=timezone.now()
+        )
 
 
 class Post(models.Model):
@@ -21,6 +39,8 @@ class Post(models.Model):
     venue = models.CharField(max_length=300, blank=True)
     venue_link = models.CharField(max_length=300, blank=True)
     attendees = models.JSONField(default=dict)
+    attendee_count = models.PositiveIntegerField(default=0)
+    capacity = models.PositiveIntegerField(null=True, blank=True)
     files = models.JSONField(default=dict)
     folder = models.CharField(max_length=300, blank=True)
     access = models.CharField(max_length=150, default="public")
@@ -38,3 +58,62 @@ class Post(models.Model):
     )
     created_at = models.DateTimeField(default=timezone.now)
     last_updated = models.DateTimeField(auto_now=True)
+
+    objects = PostQuerySet.as_manager()
+
+    # The administrator making the change, recorded with the revision
+    revision_author = None
+
+    class Meta:
+        constraints = [
+            models.CheckConstraint(
+                check=models.Q(capacity__isnull=True)
+                | models.Q(attendee_count__lte=models.F("capacity")),
+                name="post_attendees_within_capacity",
+            )
+        ]
+
+    def save(self, *args, **kwargs):
+        # Counters are only written with atomic F() updates, never from a
+        # possibly stale instance
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            skipped = set(COUNTER_FIELDS) | self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                field.attname
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.attname not in skipped
+            ]
+
+        update_fields = kwargs.get("update_fields")
+        with transaction.atomic():
+            # Every write of a tracked field is recorded, the revision diffs
+            # only apply to the text they were computed against
+            tracked = []
+            if not self._state.adding:
+                tracked = [field for field in REVISION_FIELDS if field in update_fields]
+            previous = None
+            if tracked:
+                previous = (
+                    select_for_update(Post.objects.filter(pk=self.pk))
+                    .values(*tracked)
+                    .first()
+                )
+
+            super().save(*args, **kwargs)
+
+            if previous:
+                record_revision(self, previous, self.revision_author)
+
+        # Keep the full-text index in step with the searchable fields
+        if update_fields is None or set(update_fields) & set(INDEXED_FIELDS):
+            index_post(self)
+        if update_fields is None or "tags" in update_fields:
+            sync_post_tags(self)
+        if update_fields is None or "files" in update_fields:
+            sync_post_files(self)
+
+    def delete(self, *args, **kwargs):
+        post_id = self.pk
+        result = super().delete(*args, **kwargs)
+        unindex_posts([post_id])
+        return result
@@ -0,0 +1,21 @@
+from django.db import models
+from api.models.post import Post
+
+
+class RelatedPost(models.Model):
+    """
+    A schema for precomputed related posts.
+    Holds the nearest neighbours of every published post by TF-IDF similarity.
+    """
+
+    post = models.ForeignKey(
+        Post, on_delete=models.CASCADE, related_name="related_posts"
+    )
+    related = models.ForeignKey(
+        Post, on_delete=models.CASCADE, related_name="related_from"
+    )
+    score = models.FloatField()
+
+    class Meta:
+        unique_together = [["post", "related"]]
+        indexes = [models.Index(fields=["post", "-score"])]
@@ -0,0 +1,31 @@
+from django.db import models
+from django.utils import timezone
+from api.models.administrator import Administrator
+from api.models.post import Post
+
+
+class PostRevision(models.Model):
+    """
+    A schema for the edit history of posts.
+    Every revision holds the compressed reverse diff turning the post as saved
+    by it back into the previous revision.
+    """
+
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="revisions")
+    number = models.PositiveIntegerField()
+    diff = models.BinaryField()
+    size = models.PositiveIntegerField(default=0)
+    changed_fields = models.JSONField(default=list)
+    # The SHA-1 of every changed field as saved, the text its diff applies to
+    checksums = models.JSONField(default=dict)
+    created_by = models.ForeignKey(
+        Administrator,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="post_revisions",
+    )
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = [["post", "number"]]
@@ -0,0 +1,28 @@
+from django.db import models
+from django.utils import timezone
+from api.models.member import Member
+from api.models.post import Post
+
+
+class RSVP(models.Model):
+    """
+    A schema for event registrations.
+    Holds one row per attendee of an event post.
+    """
+
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="rsvps")
+    member = models.ForeignKey(
+        Member,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="rsvps",
+    )
+    name = models.CharField(max_length=300)
+    email = models.EmailField()
+    phone_number = models.CharField(max_length=300, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = [["post", "email"]]
+        indexes = [models.Index(fields=["post", "created_at", "id"])]
@@ -26,3 +26,9 @@ class SocialPost(models.Model):
     )
     created_at = models.DateTimeField(default=timezone.now)
     last_updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "-created_at", "-id"]),
+            models.Index(fields=["created_by", "-created_at", "-id"]),
+        ]
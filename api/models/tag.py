@@ -0,0 +1,17 @@
+from django.db import models
+from api.models.post import Post
+
+
+class PostTag(models.Model):
+    """
+    A schema for the tag index of posts.
+    Maps every tag slug to the posts carrying it, maintained from Post.tags.
+    """
+
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="post_tags")
+    slug = models.SlugField(max_length=150)
+    name = models.CharField(max_length=150)
+
+    class Meta:
+        unique_together = [["post", "slug"]]
+        indexes = [models.Index(fields=["slug", "post"])]
@@ -0,0 +1,19 @@
+from django.db import models
+from api.models.post import Post
+
+
+class PostViewBucket(models.Model):
+    """
+    A schema for hourly post view counts.
+    Holds the number of views of a post within one hour.
+    """
+
+    post = models.ForeignKey(
+        Post, on_delete=models.CASCADE, related_name="view_buckets"
+    )
+    hour = models.DateTimeField()
+    views = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = [["post", "hour"]]
+        indexes = [models.Index(fields=["hour"])]
@@ -16,3 +16,5 @@ class CommentSerializer(serializers.ModelSerializer):
             "created_at",
             "last_updated",
         ]
+        # Author details are copied from the member when the comment is written
+        read_only_fields = ["author", "company"]
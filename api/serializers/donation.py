@@ -1,8 +1,9 @@
 from rest_framework import serializers
 from api.models.donation import Donation
+from api.serializers.mixins import UpdateFieldsMixin
 
 
-class DonationSerializer(serializers.ModelSerializer):
+class DonationSerializer(UpdateFieldsMixin, serializers.ModelSerializer):
     """
     Serializer class for the Donation model.
     Provides validation and serialization/deserialization of Donation objects.
@@ -1,8 +1,9 @@
 from rest_framework import serializers
 from api.models.invoice import Invoice
+from api.serializers.mixins import UpdateFieldsMixin
 
 
-class InvoiceSerializer(serializers.ModelSerializer):
+class InvoiceSerializer(UpdateFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for the Invoice model.
     Serializes the Invoice model fields for API interactions.
@@ -31,7 +31,6 @@ class MemberSerializer(serializers.ModelSerializer):
             "website_link",
             "logo",
             "bookmarks",
-            "likes",
             "registration_status",
             "subscription_status",
             "subscription_category",
@@ -129,3 +128,42 @@ class MemberSerializer(serializers.ModelSerializer):
             password = validated_data.pop("password")
             validated_data["password"] = make_password(password)
         return super().update(instance, validated_data)
+
+
+class AllMembersSerializer(serializers.ModelSerializer):
+    """
+    Serializer class for the Member model.
+    Provides serialization of Member objects for listings, without the password
+    and bookmarks.
+    """
+
+    class Meta:
+        model = Member
+        fields = [
+            "id",
+            "first_name",
+            "last_name",
+            "email",
+            "phone_number",
+            "company",
+            "designation",
+            "bio",
+            "technology",
+            "company_email",
+            "company_phone",
+            "location",
+            "postal_address",
+            "website_link",
+            "logo",
+            "registration_status",
+            "subscription_status",
+            "subscription_category",
+            "subscription_expiry",
+            "status",
+            "step",
+            "agree_to_terms",
+            "email_activation",
+            "created_by",
+            "created_at",
+            "last_updated",
+        ]
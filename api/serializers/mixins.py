@@ -0,0 +1,38 @@
+class UpdateFieldsMixin:
+    """
+    Model serializer mixin writing only the fields an update changed.
+
+    The changed columns are saved with `update_fields`, together with the
+    `auto_now` timestamps, and an update that changes nothing skips the write.
+    The names of the changed fields are left in `changed_fields`.
+    """
+
+    changed_fields = None
+
+    def update(self, instance, validated_data):
+        changed = []
+        for name, value in validated_data.items():
+            field = instance._meta.get_field(name)
+            if field.is_relation:
+                # Compare foreign keys without loading the related row
+                current = getattr(instance, field.attname)
+                new = value.pk if value is not None else None
+            else:
+                current = getattr(instance, name)
+                new = value
+
+            if current != new:
+                setattr(instance, name, value)
+                changed.append(name)
+
+        self.changed_fields = changed
+        if changed:
+            instance.save(
+                update_fields=changed
+                + [
+                    field.name
+                    for field in instance._meta.concrete_fields
+                    if getattr(field, "auto_now", False) and field.name not in changed
+                ]
+            )
+        return instance
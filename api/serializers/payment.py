@@ -1,8 +1,9 @@
 from rest_framework import serializers
 from api.models.payment import Payment
+from api.serializers.mixins import UpdateFieldsMixin
 
 
-class PaymentSerializer(serializers.ModelSerializer):
+class PaymentSerializer(UpdateFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for the Payment model.
     """
@@ -1,8 +1,9 @@
 from rest_framework import serializers
-from api.models.post import Post
+from api.models.post import COUNTER_FIELDS, Post
+from api.serializers.mixins import UpdateFieldsMixin
 
 
-class PostSerializer(serializers.ModelSerializer):
+class PostSerializer(UpdateFieldsMixin, serializers.ModelSerializer):
     """
     Serializer class for the Post model.
     Provides serialization/deserialization of Post objects.
@@ -11,6 +12,19 @@ class PostSerializer(serializers.ModelSerializer):
     class Meta:
         model = Post
         fields = '__all__'
+        # Counters are only changed with atomic increments
+        read_only_fields = COUNTER_FIELDS
+
+    def validate_capacity(self, value):
+        if (
+            value is not None
+            and self.instance is not None
+            and value < self.instance.attendee_count
+        ):
+            raise serializers.ValidationError(
+                "Capacity cannot be below the number of attendees."
+            )
+        return value
 
 
 class AllPostsSerializer(serializers.ModelSerializer):
@@ -33,6 +47,8 @@ class AllPostsSerializer(serializers.ModelSerializer):
             "venue",
             "venue_link",
             "attendees",
+            "attendee_count",
+            "capacity",
             "folder",
             "access",
             "views",
@@ -43,3 +59,33 @@ class AllPostsSerializer(serializers.ModelSerializer):
             "created_at",
             "last_updated",
         ]
+
+
+class BulkPostSerializer(serializers.Serializer):
+    """
+    Serializer class for bulk post operations.
+    Validates the post IDs and the changes applied to all of them.
+    """
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=1000
+    )
+    action = serializers.ChoiceField(choices=["update", "delete"])
+    status = serializers.CharField(max_length=150, required=False)
+    access = serializers.CharField(max_length=150, required=False)
+    category = serializers.CharField(max_length=150, required=False)
+
+    def validate(self, data):
+        if data["action"] == "update" and not self.changes(data):
+            raise serializers.ValidationError(
+                "A status, access or category change is required."
+            )
+        return data
+
+    @staticmethod
+    def changes(data):
+        return {
+            field: data[field]
+            for field in ["status", "access", "category"]
+            if field in data
+        }
@@ -0,0 +1,20 @@
+from rest_framework import serializers
+from api.models.revision import PostRevision
+
+
+class PostRevisionSerializer(serializers.ModelSerializer):
+    """
+    Serializer class for the PostRevision model.
+    Lists revisions without their diffs.
+    """
+
+    class Meta:
+        model = PostRevision
+        fields = [
+            "id",
+            "number",
+            "size",
+            "changed_fields",
+            "created_by",
+            "created_at",
+        ]
@@ -0,0 +1,27 @@
+from rest_framework import serializers
+from api.models.rsvp import RSVP
+
+
+class RSVPSerializer(serializers.ModelSerializer):
+    """
+    Serializer class for the RSVP model.
+    Provides serialization/deserialization of event registrations.
+    """
+
+    class Meta:
+        model = RSVP
+        fields = [
+            "id",
+            "post",
+            "member",
+            "name",
+            "email",
+            "phone_number",
+            "created_at",
+        ]
+        read_only_fields = ["post", "member", "created_at"]
+        # Duplicates are rejected by the database constraint
+        validators = []
+
+    def validate_email(self, value):
+        return value.strip().lower()
@@ -1,8 +1,9 @@
 from rest_framework import serializers
 from api.models.socialpost import SocialPost
+from api.serializers.mixins import UpdateFieldsMixin
 
 
-class SocialPostSerializer(serializers.ModelSerializer):
+class SocialPostSerializer(UpdateFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = SocialPost
         fields = [
@@ -18,3 +19,6 @@ class SocialPostSerializer(serializers.ModelSerializer):
             "created_at",
             "last_updated",
         ]
+        # Author details are copied from the member when the post is written,
+        # likes are counted by the like endpoints
+        read_only_fields = ["author", "company", "logo", "likes"]
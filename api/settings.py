@@ -107,6 +107,27 @@ DATABASES = {
     }
 }
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# The posts cache backend can be switched to the file based or Redis backends,
+# e.g. POSTS_CACHE_BACKEND=django.core.cache.backends.redis.RedisCache and
+# POSTS_CACHE_LOCATION=redis://127.0.0.1:6379
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "posts": {
+        "BACKEND": os.getenv(
+            "POSTS_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("POSTS_CACHE_LOCATION", "posts"),
+    },
+}
+
+POSTS_CACHE_ALIAS = "posts"
+POSTS_CACHE_TIMEOUT = 300
+
 # Password validation
 # https://docs.djangoproject.com/en/4.0/ref/settings/#auth-password-validators
 
@@ -156,3 +177,80 @@ EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD")
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 CORS_ORIGIN_ALLOW_ALL = True
+
+# Post view counting
+# Views are buffered in memory and written every interval (seconds), or
+# sooner once the number of buffered views reaches the threshold, by a
+# background thread per process unless POST_VIEWS_ASYNC is off. Views still
+# buffered when a process is killed are lost.
+POST_VIEWS_FLUSH_INTERVAL = 30
+POST_VIEWS_FLUSH_THRESHOLD = 500
+POST_VIEWS_ASYNC = os.getenv("POST_VIEWS_ASYNC", "True") == "True"
+
+# Related posts
+# Number of related posts kept per post and the TF-IDF vocabulary size.
+# Related posts are refreshed in a background thread after posts are written,
+# unless RELATED_POSTS_ASYNC is off. Every refresh reads and tokenizes all
+# published posts and holds a sparse TF-IDF matrix of them, about 16 bytes per
+# distinct term of every post, e.g. 24 MB for 10k posts of 150 terms each.
+RELATED_POSTS_COUNT = 5
+RELATED_POSTS_MAX_FEATURES = 5000
+RELATED_POSTS_ASYNC = os.getenv("RELATED_POSTS_ASYNC", "True") == "True"
+
+# Static snapshots
+# Public post listings and posts are exported as pre-compressed JSON files
+# below the root, optionally after every post write. Those exports only render
+# the written posts and the listings of their categories, in a background
+# thread unless SNAPSHOT_ASYNC is off. Posts becoming public when their
+# publication date passes need a periodic `manage.py export_snapshots`.
+SNAPSHOT_ROOT = os.getenv("SNAPSHOT_ROOT", BASE_DIR / "snapshots")
+SNAPSHOT_PAGE_SIZE = 10
+SNAPSHOT_ON_SAVE = os.getenv("SNAPSHOT_ON_SAVE", "False") == "True"
+SNAPSHOT_ASYNC = os.getenv("SNAPSHOT_ASYNC", "True") == "True"
+
+# Feeds and sitemap
+# Post links point at the frontend, FEED_POST_PATH is formatted with the
+# post id and category.
+FEED_SITE_URL = os.getenv("FRONTEND_URL", "")
+FEED_POST_PATH = os.getenv("FEED_POST_PATH", "/{category}/{id}")
+FEED_ITEMS = 50
+
+# Trending posts
+# Views are kept in hourly buckets for the window (hours) and weighted down
+# by half every half-life (hours). The ranking is recomputed at most every
+# refresh interval (seconds) or by the refresh_trending_posts command.
+TRENDING_WINDOW_HOURS = 168
+TRENDING_HALF_LIFE_HOURS = 24
+TRENDING_REFRESH_INTERVAL = 900
+TRENDING_POSTS_COUNT = 10
+
+# Social feed
+# Default and maximum number of socialposts per page, and maximum number of
+# latest comments embedded per socialpost.
+SOCIALPOSTS_PAGE_SIZE = 20
+SOCIALPOSTS_MAX_PAGE_SIZE = 100
+SOCIALPOST_COMMENTS_MAX = 10
+
+# Social feed events
+# New socialposts and comments are streamed as server-sent events. Every
+# connection buffers up to SSE_QUEUE_SIZE events and is closed when it falls
+# further behind, idle connections get a heartbeat every
+# SSE_HEARTBEAT_INTERVAL seconds, and connections are closed after
+# SSE_MAX_DURATION seconds. Clients reconnect after SSE_RETRY milliseconds.
+# Events reach the streams of other processes through
+# api.utils.events.CacheBackend, polled every EVENTS_POLL_INTERVAL seconds.
+# The stream is only served when the project runs under an ASGI server with
+# api.asgi.application, e.g. `uvicorn api.asgi:application`, WSGI servers
+# answer it with 501.
+EVENTS_BACKEND = os.getenv("EVENTS_BACKEND", "api.utils.events.LocalBackend")
+EVENTS_POLL_INTERVAL = 1
+SSE_QUEUE_SIZE = 100
+SSE_HEARTBEAT_INTERVAL = 15
+SSE_MAX_DURATION = 600
+SSE_RETRY = 3000
+
+# Author snapshots
+# Member name, company and logo changes are copied onto their socialposts and
+# comments in chunks of this many rows, in a background thread by default.
+AUTHOR_PROPAGATION_CHUNK = 500
+AUTHOR_PROPAGATION_ASYNC = os.getenv("AUTHOR_PROPAGATION_ASYNC", "True") == "True"
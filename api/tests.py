@@ -0,0 +1,496 @@
+import datetime
+import json
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+from django.db import OperationalError
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from api.models.administrator import Administrator
+from api.models.comment import Comment
+from api.models.like import Like
+from api.models.member import Member
+from api.models.post import Post
+from api.models.revision import PostRevision
+from api.models.socialpost import SocialPost
+from api.utils.cache import get_cache
+from api.utils.counters import post_views
+from api.utils.revisions import apply_diff, make_diff
+from api.utils import snapshots
+from api.utils.related import TermMatrix
+
+
+class SearchPostsQueriesTest(TestCase):
+    """
+    The post search costs the same number of queries whatever the page size.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = Administrator.objects.create(
+            username="admin", email="admin@example.com", role="super-admin"
+        )
+        authors = [
+            Administrator.objects.create(
+                username=f"author{index}",
+                email=f"author{index}@example.com",
+                first_name=f"Author{index}",
+                last_name="Example",
+            )
+            for index in range(5)
+        ]
+        published = timezone.now() - datetime.timedelta(days=1)
+        for index in range(60):
+            Post.objects.create(
+                title=f"Post {index} about networks",
+                excerpt="An excerpt",
+                content="Some content",
+                category="news",
+                status="published",
+                published=published - datetime.timedelta(hours=index),
+                created_by=authors[index % len(authors)],
+            )
+
+    def setUp(self):
+        # Administrators search without the response cache
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def search(self, **body):
+        return self.client.post(
+            "/posts/search",
+            {
+                "category": "news",
+                "project_status": None,
+                "access": "public",
+                "status": "published",
+                **body,
+            },
+            format="json",
+        )
+
+    def test_page_number_queries(self):
+        for limit in [5, 20, 50]:
+            # The count and the page with its authors joined
+            with self.assertNumQueries(2):
+                response = self.search(limit=limit, page=1)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.data["results"]), limit)
+            self.assertTrue(response.data["results"][0]["author"])
+
+    def test_keyword_queries(self):
+        for limit in [5, 20, 50]:
+            with self.assertNumQueries(2):
+                response = self.search(keyword="networks", limit=limit, page=1)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data["count"], 60)
+            self.assertEqual(len(response.data["results"]), limit)
+
+    def test_invalid_cursor_limits(self):
+        for limit in [0, -1, "abc", None]:
+            response = self.search(limit=limit, cursor=None)
+            self.assertEqual(response.status_code, 400, limit)
+            self.assertEqual(response.data["error"], "Invalid limit.")
+
+    def test_markup_is_not_indexed(self):
+        Post.objects.create(
+            title="Formatted",
+            content='<p style="color: red"><span class="highlight">Marker'
+            "</span></p><p>text&amp;more</p>",
+            category="news",
+            status="published",
+            published=timezone.now() - datetime.timedelta(days=1),
+            created_by=self.admin,
+        )
+        for keyword, count in [
+            ("span", 0),
+            ("style", 0),
+            ("color", 0),
+            ("highlight", 0),
+            ("amp", 0),
+            ("marker", 1),
+            ("text more", 1),
+        ]:
+            response = self.search(keyword=keyword, limit=5, page=1)
+            self.assertEqual(response.data["count"], count, keyword)
+
+    def test_cursor_queries(self):
+        for limit in [5, 20, 50]:
+            # The page only, without a count
+            with self.assertNumQueries(1):
+                response = self.search(keyword="networks", limit=limit, cursor=None)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.data["results"]), limit)
+
+
+class SocialPostQueriesTest(TestCase):
+    """
+    The socialpost feeds cost the same number of queries whatever the page
+    size and however many comments and likes their socialposts have.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        members = [
+            Member.objects.create(
+                first_name=f"Member{index}",
+                last_name="Example",
+                email=f"member{index}@example.com",
+                company="Example",
+            )
+            for index in range(3)
+        ]
+        cls.member = members[0]
+        created = timezone.now() - datetime.timedelta(days=1)
+        cls.socialposts = [
+            SocialPost.objects.create(
+                post=f"Socialpost {index}",
+                created_by=members[index % len(members)],
+                created_at=created - datetime.timedelta(hours=index),
+            )
+            for index in range(60)
+        ]
+        for index, socialpost in enumerate(cls.socialposts):
+            for number in range(index % 4):
+                Comment.objects.create(
+                    comment=f"Comment {number}",
+                    socialpost=socialpost.id,
+                    created_by=members[number % len(members)],
+                )
+            if index % 2:
+                Like.objects.create(member=cls.member, socialpost=socialpost)
+
+    def setUp(self):
+        get_cache().clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.member)
+
+    def test_feed_queries(self):
+        for limit in [5, 20, 50]:
+            # The page and the likes of the member
+            with self.assertNumQueries(2):
+                response = self.client.get("/socialposts", {"limit": limit})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.data["results"]), limit)
+            self.assertEqual(
+                [socialpost["liked"] for socialpost in response.data["results"]][:2],
+                [False, True],
+            )
+
+    def test_feed_comments_queries(self):
+        for limit in [5, 20, 50]:
+            # Plus the comment counts and the latest comments
+            with self.assertNumQueries(4):
+                response = self.client.get(
+                    "/socialposts", {"limit": limit, "comments": 2}
+                )
+            self.assertEqual(response.status_code, 200)
+            results = response.data["results"]
+            self.assertEqual(len(results), limit)
+            self.assertEqual(
+                [socialpost["comment_count"] for socialpost in results][:4],
+                [0, 1, 2, 3],
+            )
+            self.assertEqual(len(results[3]["comments"]), 2)
+
+    def test_feed_cursor_queries(self):
+        response = self.client.get("/socialposts", {"limit": 5})
+        for limit in [5, 20, 50]:
+            with self.assertNumQueries(2):
+                page = self.client.get(
+                    "/socialposts", {"limit": limit, "cursor": response.data["next"]}
+                )
+            self.assertEqual(page.status_code, 200)
+            self.assertEqual(len(page.data["results"]), limit)
+
+    def test_member_socialposts_queries(self):
+        for limit in [5, 10, 20]:
+            with self.assertNumQueries(1):
+                response = self.client.get(
+                    f"/socialposts/member/{self.member.id}", {"limit": limit}
+                )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response["X-Cache"], "MISS")
+            self.assertEqual(len(response.data["results"]), limit)
+
+            # Repeated pages come from the cache
+            with self.assertNumQueries(0):
+                response = self.client.get(
+                    f"/socialposts/member/{self.member.id}", {"limit": limit}
+                )
+            self.assertEqual(response["X-Cache"], "HIT")
+
+    def test_socialpost_queries(self):
+        socialpost = self.socialposts[0]
+        # The validators and the socialpost
+        with self.assertNumQueries(2):
+            response = self.client.get(f"/socialpost/{socialpost.id}")
+        self.assertEqual(response.status_code, 200)
+
+        # A fresh copy is answered from the validators alone
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                f"/socialpost/{socialpost.id}",
+                HTTP_IF_NONE_MATCH=response["ETag"],
+            )
+        self.assertEqual(response.status_code, 304)
+
+    def test_socialpost_comments_queries(self):
+        for index, socialpost in enumerate(self.socialposts[:4]):
+            with self.assertNumQueries(1):
+                response = self.client.get(f"/comments/socialpost/{socialpost.id}")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.data), index)
+
+
+class PostRevisionsTest(TestCase):
+    """
+    Every write of a post's title, excerpt or content is recorded as a diff
+    that rebuilds the previous version.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = Administrator.objects.create(
+            username="admin", email="admin@example.com", role="super-admin"
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.post = Post.objects.create(
+            title="Title",
+            excerpt="An excerpt",
+            content="alpha beta gamma delta",
+            category="news",
+            created_by=self.admin,
+        )
+
+    def update(self, **data):
+        response = self.client.post(f"/post/update/{self.post.id}", data, format="json")
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def revision(self, number):
+        return self.client.get(f"/post/{self.post.id}/revisions/{number}")
+
+    def test_diff_round_trips(self):
+        texts = [
+            "",
+            "alpha beta gamma delta",
+            "alpha  beta\n\ngamma",
+            "<p>alpha <b>beta</b></p>\n<p>gamma</p>",
+            "<p class='x'>alpha</p> beta < gamma > delta <",
+            "delta gamma beta alpha",
+        ]
+        for new in texts:
+            for old in texts:
+                self.assertEqual(apply_diff(new, make_diff(new, old)), old)
+
+    def test_updates_are_recorded(self):
+        self.update(content="alpha beta epsilon delta")
+        self.update(title="New title", content="<p>alpha</p> beta")
+
+        revisions = PostRevision.objects.filter(post=self.post).order_by("number")
+        self.assertEqual(
+            [revision.changed_fields for revision in revisions],
+            [["content"], ["title", "content"]],
+        )
+        self.assertEqual(self.revision(0).data["content"], "alpha beta gamma delta")
+        self.assertEqual(self.revision(1).data["content"], "alpha beta epsilon delta")
+        self.assertEqual(self.revision(1).data["title"], "Title")
+        self.assertEqual(self.revision(2).data["title"], "New title")
+
+    def test_model_saves_are_recorded(self):
+        self.update(content="alpha beta epsilon delta")
+        post = Post.objects.get(pk=self.post.id)
+        post.content = "zeta"
+        post.save()
+
+        self.assertEqual(PostRevision.objects.filter(post=self.post).count(), 2)
+        self.assertEqual(self.revision(0).data["content"], "alpha beta gamma delta")
+        self.assertEqual(self.revision(1).data["content"], "alpha beta epsilon delta")
+
+        # Saving other fields records nothing
+        post.save(update_fields=["status"])
+        self.assertEqual(PostRevision.objects.filter(post=self.post).count(), 2)
+
+    def test_restore(self):
+        self.update(content="alpha beta epsilon delta")
+        self.update(excerpt="Another excerpt")
+
+        response = self.client.post(f"/post/{self.post.id}/revisions/0/restore")
+        self.assertEqual(response.status_code, 200)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.content, "alpha beta gamma delta")
+        self.assertEqual(self.post.excerpt, "An excerpt")
+
+        # The restore is a revision of its own and can be undone
+        revision = PostRevision.objects.filter(post=self.post).latest("number")
+        self.assertEqual(revision.number, 3)
+        response = self.client.post(f"/post/{self.post.id}/revisions/2/restore")
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.content, "alpha beta epsilon delta")
+        self.assertEqual(self.post.excerpt, "Another excerpt")
+
+    def test_unrecorded_changes_are_refused(self):
+        self.update(content="alpha beta epsilon delta")
+        Post.objects.filter(pk=self.post.id).update(content="zeta")
+
+        self.assertEqual(self.revision(0).status_code, 409)
+        response = self.client.post(f"/post/{self.post.id}/revisions/0/restore")
+        self.assertEqual(response.status_code, 409)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.content, "zeta")
+        self.assertEqual(PostRevision.objects.filter(post=self.post).count(), 1)
+
+
+@override_settings(POST_VIEWS_ASYNC=False)
+class PostViewsTest(TestCase):
+    """
+    Post reads never fail because their buffered views could not be written.
+    """
+
+    def setUp(self):
+        self.post = Post.objects.create(
+            title="Title", category="news", status="published", created_by=None
+        )
+
+    def test_failed_flush_keeps_views(self):
+        with mock.patch.object(post_views, "flush_threshold", 1), mock.patch(
+            "api.utils.counters.write_buckets",
+            side_effect=OperationalError("database is locked"),
+        ), self.assertLogs("api.utils.counters", "ERROR"):
+            response = APIClient().get(f"/post/{self.post.id}")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["views"], 1)
+        self.assertEqual(post_views.pending(self.post.id), 1)
+
+        self.assertEqual(post_views.flush(), 1)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views, 1)
+        self.assertEqual(self.post.view_buckets.get().views, 1)
+
+
+class SnapshotsTest(TestCase):
+    """
+    Post writes only export the written posts and the listings they are in.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = Administrator.objects.create(
+            username="admin", email="admin@example.com", role="super-admin"
+        )
+        published = timezone.now() - datetime.timedelta(days=1)
+        cls.posts = [
+            Post.objects.create(
+                title=f"Post {index}",
+                category=category,
+                status="published",
+                published=published,
+                created_by=cls.admin,
+            )
+            for index, category in enumerate(["news", "news", "blogs", "Events"])
+        ]
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = Path(directory.name)
+        settings = override_settings(
+            SNAPSHOT_ROOT=self.root,
+            SNAPSHOT_ON_SAVE=True,
+            SNAPSHOT_ASYNC=False,
+            RELATED_POSTS_ASYNC=False,
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        snapshots.export_snapshots()
+
+    def write(self, url, data=None):
+        listings = mock.patch.object(
+            snapshots, "listing_pages", wraps=snapshots.listing_pages
+        )
+        with listings as listing_pages, self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url, data, format="json")
+        self.assertLess(response.status_code, 300)
+        return sorted(call.args[1] for call in listing_pages.call_args_list)
+
+    def assertUpToDate(self):
+        # A full run finds nothing left to write or remove
+        stats = snapshots.export_snapshots()
+        self.assertEqual((stats["written"], stats["removed"]), (0, 0))
+
+    def test_update(self):
+        post = self.posts[0]
+        listings = self.write(f"/post/update/{post.id}", {"title": "Changed"})
+        self.assertEqual(listings, ["all", "news"])
+        content = json.loads((self.root / f"post/{post.id}.json").read_text())
+        self.assertEqual(content["title"], "Changed")
+        self.assertUpToDate()
+
+    def test_category_change(self):
+        post = self.posts[2]
+        listings = self.write(f"/post/update/{post.id}", {"category": "news"})
+        self.assertEqual(listings, ["all", "news"])
+        self.assertFalse((self.root / "posts/blogs/page-1.json").exists())
+        self.assertUpToDate()
+
+    def test_delete(self):
+        post = self.posts[3]
+        listings = self.write(f"/post/delete/{post.id}")
+        self.assertEqual(listings, ["all"])
+        self.assertFalse((self.root / f"post/{post.id}.json").exists())
+        self.assertFalse((self.root / "posts/events/page-1.json").exists())
+        self.assertUpToDate()
+
+    def test_unpublish(self):
+        post = self.posts[0]
+        listings = self.write(f"/post/update/{post.id}", {"status": "draft"})
+        self.assertEqual(listings, ["all", "news"])
+        self.assertFalse((self.root / f"post/{post.id}.json").exists())
+        self.assertUpToDate()
+
+
+class PostTagsTest(TestCase):
+    def test_long_tags(self):
+        name = "Very long tag " * 20
+        post = Post.objects.create(
+            title="Tagged", category="news", tags=[name, name + "more"], created_by=None
+        )
+        tag = post.post_tags.get()
+        self.assertEqual(len(tag.slug), 149)
+        self.assertEqual(tag.slug, "very-long-tag-" * 10 + "very-long")
+        self.assertEqual(tag.name, name.strip()[:150])
+
+
+class TermMatrixTest(TestCase):
+    def test_similarities(self):
+        dense = np.array(
+            [
+                [0.6, 0.8, 0.0, 0.0],
+                [0.0, 0.0, 0.0, 0.0],
+                [0.0, 0.6, 0.0, 0.8],
+                [1.0, 0.0, 0.0, 0.0],
+            ],
+            dtype=np.float32,
+        )
+        rows, columns = np.nonzero(dense)
+        matrix = TermMatrix(
+            rows.astype(np.int32),
+            columns.astype(np.int32),
+            dense[rows, columns],
+            dense.shape,
+        )
+        for row in range(len(dense)):
+            np.testing.assert_allclose(
+                matrix.similarities(row), dense @ dense[row], rtol=1e-6
+            )
@@ -20,6 +20,7 @@ from api.views import emails
 from api.views import auth
 from api.views import posts
 from api.views import socialposts
+from api.views import likes
 from api.views import comments
 from api.views import members
 from api.views import invoices
@@ -30,6 +31,9 @@ from api.views import administrators
 from api.views import kopokopo
 from api.views import home
 from api.views import dashboard
+from api.views import rsvps
+from api.views import feeds
+from api.views import stream
 
 from rest_framework_simplejwt.views import TokenObtainPairView
 
@@ -46,16 +50,39 @@ urlpatterns = [
     path('auth/administrator/login', auth.administrator_login),
     path('auth/resetlink', auth.reset_link),
     path('post/<int:post_id>', posts.get_post, name='get-post'),
+    path('post/<int:post_id>/related', posts.related_posts, name='related-posts'),
     path('post', posts.create_post, name='create-post'),
     path('post/update/<int:post_id>', posts.update_post, name='update-post'),
     path('post/delete/<int:post_id>', posts.delete_post, name='delete-post'),
+    path('post/<int:post_id>/files/attach', posts.attach_post_files, name='attach-post-files'),
+    path('post/<int:post_id>/files/detach', posts.detach_post_files, name='detach-post-files'),
+    path('post/<int:post_id>/revisions', posts.post_revisions, name='post-revisions'),
+    path('post/<int:post_id>/revisions/<int:number>', posts.get_post_revision, name='get-post-revision'),
+    path('post/<int:post_id>/revisions/<int:number>/restore', posts.restore_post_revision, name='restore-post-revision'),
+    path('post/<int:post_id>/rsvp', rsvps.create_rsvp, name='create-rsvp'),
+    path('post/<int:post_id>/rsvp/cancel', rsvps.cancel_rsvp, name='cancel-rsvp'),
+    path('post/<int:post_id>/attendees', rsvps.post_attendees, name='post-attendees'),
     path('posts/search', posts.search_posts, name='search-posts'),
+    path('posts/bulk', posts.bulk_posts, name='bulk-posts'),
+    path('posts/tags', posts.tag_cloud, name='tag-cloud'),
+    path('posts/trending', posts.trending_posts, name='trending-posts'),
+    path('posts/events.ics', feeds.events_calendar, name='events-calendar'),
+    path('feeds/posts.xml', feeds.posts_feed, name='posts-feed'),
+    path('feeds/posts.atom', feeds.posts_feed, {'feed_type': 'atom'}, name='posts-atom-feed'),
+    path('feeds/<slug:category>.xml', feeds.posts_feed, name='category-feed'),
+    path('feeds/<slug:category>.atom', feeds.posts_feed, {'feed_type': 'atom'}, name='category-atom-feed'),
+    path('sitemap.xml', feeds.sitemap, name='sitemap'),
+    path('posts/tag/<slug:slug>', posts.tag_posts, name='tag-posts'),
     path('socialpost/<int:socialpost_id>', socialposts.get_socialpost, name='get-socialpost'),
     path('socialposts', socialposts.get_socialposts, name='get-socialposts'),
     path('socialpost', socialposts.create_socialpost, name='create-socialpost'),
     path('socialpost/update/<int:socialpost_id>', socialposts.update_socialpost, name='update-socialpost'),
     path('socialpost/delete/<int:socialpost_id>', socialposts.delete_socialpost, name='delete-socialpost'),
     path('socialposts/member/<int:member_id>', socialposts.member_socialposts, name='member-socialposts'),
+    path('socialpost/<int:socialpost_id>/like', likes.like_socialpost, name='like-socialpost'),
+    path('socialpost/<int:socialpost_id>/unlike', likes.unlike_socialpost, name='unlike-socialpost'),
+    path('socialposts/liked', likes.liked_socialposts, name='liked-socialposts'),
+    path('socialposts/stream', stream.socialposts_stream, name='socialposts-stream'),
     path('comment', comments.create_comment, name='create-comment'),
     path('comment/update/<int:comment_id>', comments.update_comment, name='update-comment'),
     path('comment/delete/<int:comment_id>', comments.delete_comment, name='delete-comment'),
@@ -99,5 +126,6 @@ urlpatterns = [
     path('dashboard/stats/general', dashboard.general_stats, name='get-general-status'),
     path('dashboard/stats/money', dashboard.money_stats, name='get-money-status'),
     path('dashboard/stats/member/', dashboard.member_stats, name='get-member-status'),
+    path('dashboard/stats/cache', dashboard.post_cache_stats, name='get-cache-status'),
 
 ]
@@ -0,0 +1,105 @@
+import threading
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from api.utils.cache import bump_member_caches
+
+# Member fields copied onto the socialposts and comments they write
+AUTHOR_FIELDS = ["first_name", "last_name", "company", "logo"]
+
+
+def author_snapshot(member, model):
+    """
+    Build the author columns stored on content written by a member.
+
+    Member values can be longer than the columns they are copied to, so they
+    are cut to the column sizes.
+
+    Args:
+        member (Member): The authoring member.
+        model (Model): The model of the content, SocialPost or Comment.
+
+    Returns:
+        dict: The author, company and, if the model stores one, logo values.
+    """
+    snapshot = {
+        "author": f"{member.first_name} {member.last_name}",
+        "company": member.company,
+        "logo": member.logo,
+    }
+    columns = {field.name: field for field in model._meta.concrete_fields}
+    return {
+        name: value[: columns[name].max_length]
+        for name, value in snapshot.items()
+        if name in columns
+    }
+
+
+def propagate_author(member_id):
+    """
+    Copy the current author details of a member onto all their socialposts
+    and comments.
+
+    Rows are updated a chunk of IDs at a time, each chunk in its own short
+    transaction, so a prolific member never locks their whole history at once.
+
+    Args:
+        member_id (int): The ID of the member.
+
+    Returns:
+        int: The number of rows updated.
+    """
+    from api.models.comment import Comment
+    from api.models.member import Member
+    from api.models.socialpost import SocialPost
+
+    member = Member.objects.filter(pk=member_id).only(*AUTHOR_FIELDS).first()
+    if member is None:
+        return 0
+
+    size = settings.AUTHOR_PROPAGATION_CHUNK
+    updated = 0
+    for model in [SocialPost, Comment]:
+        snapshot = author_snapshot(member, model)
+        ids = list(
+            model.objects.filter(created_by_id=member_id)
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        for start in range(0, len(ids), size):
+            with transaction.atomic():
+                updated += model.objects.filter(
+                    pk__in=ids[start : start + size]
+                ).update(**snapshot, last_updated=timezone.now())
+
+    bump_member_caches(member_id)
+    return updated
+
+
+def _propagate_in_background(member_id):
+    try:
+        propagate_author(member_id)
+    finally:
+        connection.close()
+
+
+def schedule_author_propagation(member_id):
+    """
+    Propagate the author details of a member once the current transaction
+    commits, in a background thread unless AUTHOR_PROPAGATION_ASYNC is off.
+
+    Args:
+        member_id (int): The ID of the member that changed.
+    """
+
+    def start():
+        if settings.AUTHOR_PROPAGATION_ASYNC:
+            threading.Thread(
+                target=_propagate_in_background, args=(member_id,), daemon=True
+            ).start()
+        else:
+            propagate_author(member_id)
+
+    transaction.on_commit(start)
@@ -0,0 +1,179 @@
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Min
+from django.utils import timezone
+
+# Namespace holding the version shared by every post cache, whatever the category
+ALL_POSTS = "posts:"
+
+
+def get_cache():
+    return caches[settings.POSTS_CACHE_ALIAS]
+
+
+def get_version(namespace):
+    """
+    Return the current version of a cache namespace.
+
+    Versions are timestamps, so a version that was evicted is replaced by a new
+    one and can never resurrect entries written under an older version.
+
+    Args:
+        namespace (str): The cache namespace.
+
+    Returns:
+        str: The version to embed in cache keys of the namespace.
+    """
+    cache = get_cache()
+    key = f"version:{namespace}"
+
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, str(time.time_ns()), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_versions(*namespaces):
+    """
+    Invalidate every cache entry keyed on the given namespaces.
+
+    Args:
+        namespaces (str): The cache namespaces to invalidate.
+    """
+    version = str(time.time_ns())
+    get_cache().set_many(
+        {f"version:{namespace}": version for namespace in set(namespaces)}, None
+    )
+
+
+def bump_post_caches(*categories):
+    """
+    Invalidate the cached post responses after posts were written.
+
+    Args:
+        categories (str): The categories of the written posts, before and after the change.
+    """
+    bump_versions(ALL_POSTS, *[f"posts:{category}" for category in categories])
+
+
+def post_namespace(category):
+    return f"posts:{category}" if category else ALL_POSTS
+
+
+def member_namespace(member_id):
+    return f"members:{member_id}"
+
+
+def bump_member_caches(*member_ids):
+    """
+    Invalidate the cached responses built from the content of members.
+
+    Args:
+        member_ids (int): The IDs of the members whose content was written.
+    """
+    bump_versions(
+        *[member_namespace(member_id) for member_id in member_ids if member_id]
+    )
+
+
+def make_key(prefix, namespace, params):
+    """
+    Build a cache key from a namespace version and normalized parameters.
+
+    Args:
+        prefix (str): The name of the cached resource.
+        namespace (str): The namespace whose version the key depends on.
+        params (dict): The parameters identifying the response.
+
+    Returns:
+        str: The cache key.
+    """
+    digest = hashlib.sha1(
+        json.dumps(params, sort_keys=True, default=str).encode()
+    ).hexdigest()
+    return f"{prefix}:{get_version(namespace)}:{digest}"
+
+
+def get_cached(key):
+    """
+    Look up a cached response and count the hit or miss.
+
+    Args:
+        key (str): The cache key.
+
+    Returns:
+        The cached value, or None on a miss.
+    """
+    cache = get_cache()
+    value = cache.get(key)
+    _count("hits" if value is not None else "misses")
+    return value
+
+
+def set_cached(key, value, timeout=None):
+    if timeout is None:
+        timeout = settings.POSTS_CACHE_TIMEOUT
+    get_cache().set(key, value, timeout)
+
+
+def _count(name):
+    cache = get_cache()
+    key = f"stats:{name}"
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+
+
+def cache_stats():
+    """
+    Return the hit and miss counters of the post caches.
+
+    Returns:
+        dict: The number of hits and misses since the counters were created.
+    """
+    stats = get_cache().get_many(["stats:hits", "stats:misses"])
+    return {
+        "hits": stats.get("stats:hits", 0),
+        "misses": stats.get("stats:misses", 0),
+    }
+
+
+def post_timeout(category=None):
+    """
+    Return how long a cached post listing stays valid.
+
+    Public listings only show posts published before now, and event listings
+    put past events last, so an entry must expire at the next scheduled
+    publication or event start even when no post is written.
+
+    Args:
+        category (str): The category of the listing, if any.
+
+    Returns:
+        int: The timeout in seconds.
+    """
+    from api.models.post import Post
+
+    now = timezone.now()
+    posts = Post.objects.all()
+    if category:
+        posts = posts.filter(category=category)
+
+    boundaries = [posts.filter(published__gte=now).aggregate(at=Min("published"))["at"]]
+    if category == "events":
+        boundaries.append(
+            posts.filter(event_date__gte=now).aggregate(at=Min("event_date"))["at"]
+        )
+
+    timeout = settings.POSTS_CACHE_TIMEOUT
+    for boundary in boundaries:
+        if boundary is not None:
+            timeout = min(timeout, int((boundary - now).total_seconds()) + 1)
+    return timeout
@@ -0,0 +1,99 @@
+import datetime
+import hashlib
+from functools import wraps
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def last_updated_of(model, *lookups):
+    """
+    Build a validator function reading `last_updated` columns of a single row.
+
+    Args:
+        model (Model): The model of the resource.
+        lookups (str): Extra columns the response depends on, e.g. the
+            `last_updated` of a joined author ("created_by__last_updated").
+
+    Returns:
+        function: A function taking a primary key and returning the column
+        values, or None when the row does not exist.
+    """
+
+    def get_validators(pk):
+        return model.objects.filter(pk=pk).values_list("last_updated", *lookups).first()
+
+    return get_validators
+
+
+def make_validators(pk, values):
+    """
+    Derive a strong ETag and a Last-Modified timestamp from validator values.
+
+    Args:
+        pk: The primary key of the resource.
+        values (tuple): The values the response depends on.
+
+    Returns:
+        tuple: The quoted ETag and the Last-Modified time as a UNIX timestamp.
+    """
+    digest = hashlib.sha1(
+        ":".join([str(pk)] + [str(value) for value in values]).encode()
+    ).hexdigest()
+
+    timestamps = [
+        value.timestamp() for value in values if isinstance(value, datetime.datetime)
+    ]
+    last_modified = int(max(timestamps)) if timestamps else None
+
+    return quote_etag(digest), last_modified
+
+
+def set_validators(response, etag, last_modified):
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
+    return response
+
+
+def conditional_on_last_updated(get_validators, pk_kwarg):
+    """
+    Answer conditional GET requests for a single resource without rendering it.
+
+    The validators are read with a cheap single-row lookup. When they match the
+    request's If-None-Match or If-Modified-Since headers a 304 response is
+    returned straight away, otherwise the view runs and the ETag and
+    Last-Modified headers are added to its response.
+
+    Args:
+        get_validators (function): Returns the validator values for a primary
+            key, see last_updated_of.
+        pk_kwarg (str): The name of the URL argument holding the primary key.
+
+    Returns:
+        function: The view decorator.
+    """
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            pk = kwargs.get(pk_kwarg)
+            values = get_validators(pk)
+
+            # Let the view produce its usual not found response
+            if values is None:
+                return view_func(request, *args, **kwargs)
+
+            etag, last_modified = make_validators(pk, values)
+
+            response = get_conditional_response(request, etag, last_modified)
+            if response is None:
+                response = view_func(request, *args, **kwargs)
+
+            if response.status_code in [200, 304]:
+                set_validators(response, etag, last_modified)
+            return response
+
+        return _wrapped_view
+
+    return decorator
@@ -0,0 +1,195 @@
+import atexit
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCounter:
+    """
+    Buffers post view increments in memory and writes them in batches.
+
+    Every read only bumps an in-process counter. A background thread writes
+    the buffered counts every flush interval, or as soon as enough views are
+    pending, with one `views = views + n` UPDATE per distinct increment, so
+    concurrent readers and worker processes never overwrite each other's
+    counts. The same flush adds the views to the hourly buckets of the posts.
+    Failed flushes keep their views buffered for the next one.
+    """
+
+    def __init__(self, flush_interval, flush_threshold):
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self._pending = Counter()
+        self._buckets = Counter()
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def record(self, post_id):
+        """
+        Record a single view of a post.
+
+        The buffer is flushed by the background thread, or by the read itself
+        when POST_VIEWS_ASYNC is off, in which case a failed flush is logged
+        rather than failing the read.
+
+        Args:
+            post_id (int): The ID of the viewed post.
+        """
+        hour = timezone.now().replace(minute=0, second=0, microsecond=0)
+        with self._lock:
+            self._pending[post_id] += 1
+            self._buckets[(post_id, hour)] += 1
+            full = sum(self._pending.values()) >= self.flush_threshold
+            due = full or time.monotonic() - self._last_flush >= self.flush_interval
+
+        if settings.POST_VIEWS_ASYNC:
+            self.start()
+            if full:
+                self._wake.set()
+        elif due:
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Writing the post views failed.")
+
+    def start(self):
+        """
+        Start the background flush thread of this process, once.
+        """
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self.run, daemon=True)
+                self._thread.start()
+
+    def run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Writing the post views failed.")
+            finally:
+                connection.close()
+
+    def pending(self, post_id):
+        """
+        Return the number of views recorded for a post but not yet written.
+
+        Args:
+            post_id (int): The ID of the post.
+
+        Returns:
+            int: The buffered view count.
+        """
+        with self._lock:
+            return self._pending.get(post_id, 0)
+
+    def flush(self):
+        """
+        Write all buffered view counts to the database.
+
+        Returns:
+            int: The number of views written.
+        """
+        from api.models.post import Post
+
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            buckets, self._buckets = self._buckets, Counter()
+            self._last_flush = time.monotonic()
+
+        if not pending:
+            return 0
+
+        # Posts sharing the same increment are updated in a single statement
+        batches = defaultdict(list)
+        for post_id, count in pending.items():
+            batches[count].append(post_id)
+
+        try:
+            with transaction.atomic():
+                for count, post_ids in batches.items():
+                    Post.objects.filter(pk__in=post_ids).update(
+                        views=F("views") + count
+                    )
+                write_buckets(buckets)
+        except Exception:
+            with self._lock:
+                self._pending.update(pending)
+                self._buckets.update(buckets)
+            raise
+
+        return sum(pending.values())
+
+
+def write_buckets(buckets):
+    """
+    Add view counts to the hourly view buckets of posts.
+
+    Existing buckets are incremented with one UPDATE per hour and increment,
+    missing ones are created in bulk. When another process creates one of the
+    buckets first, the whole write is retried.
+
+    Args:
+        buckets (Counter): The view counts keyed by post ID and hour.
+    """
+    from api.models.post import Post
+    from api.models.viewbucket import PostViewBucket
+
+    hours = defaultdict(dict)
+    for (post_id, hour), count in buckets.items():
+        hours[hour][post_id] = count
+
+    for attempt in range(3):
+        try:
+            with transaction.atomic():
+                for hour, counts in hours.items():
+                    existing = set(
+                        PostViewBucket.objects.filter(
+                            hour=hour, post_id__in=list(counts)
+                        ).values_list("post_id", flat=True)
+                    )
+
+                    batches = defaultdict(list)
+                    for post_id in existing:
+                        batches[counts[post_id]].append(post_id)
+                    for count, post_ids in batches.items():
+                        PostViewBucket.objects.filter(
+                            hour=hour, post_id__in=post_ids
+                        ).update(views=F("views") + count)
+
+                    # Views of deleted posts are dropped
+                    missing = set(counts) - existing
+                    missing &= set(
+                        Post.objects.filter(pk__in=missing).values_list("id", flat=True)
+                    )
+                    PostViewBucket.objects.bulk_create(
+                        [
+                            PostViewBucket(
+                                post_id=post_id, hour=hour, views=counts[post_id]
+                            )
+                            for post_id in missing
+                        ]
+                    )
+            return
+        except IntegrityError:
+            if attempt == 2:
+                raise
+
+
+post_views = ViewCounter(
+    settings.POST_VIEWS_FLUSH_INTERVAL, settings.POST_VIEWS_FLUSH_THRESHOLD
+)
+
+atexit.register(post_views.flush)
@@ -0,0 +1,212 @@
+import asyncio
+import json
+import threading
+import time
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+from api.utils.cache import get_cache
+
+
+class Subscription:
+    """
+    The bounded event queue of one stream, read on the event loop it was
+    created on.
+    """
+
+    def __init__(self, queue_size):
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=queue_size)
+
+    def put(self, event):
+        # Runs on the subscription's loop. A stream that fell behind is ended
+        # rather than buffering without bound, the client reconnects and
+        # catches up from the feed.
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+    async def get(self, timeout):
+        """
+        Wait for the next event.
+
+        Args:
+            timeout (float): The number of seconds to wait.
+
+        Returns:
+            dict: The event, or None when the stream must end.
+
+        Raises:
+            asyncio.TimeoutError: If no event arrived in time.
+        """
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+
+class EventBroker:
+    """
+    Publishes events to the streams connected to this process.
+
+    Events go through a backend, which delivers them back to the broker of
+    every process it connects, so streams see the events published by any
+    worker.
+    """
+
+    def __init__(self, backend, queue_size):
+        self.queue_size = queue_size
+        self.backend = import_string(backend)(self.deliver)
+        self._subscriptions = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self):
+        """
+        Open an event queue, must be called on the event loop reading it.
+
+        Returns:
+            Subscription: The new subscription.
+        """
+        subscription = Subscription(self.queue_size)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        self.backend.start()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def publish(self, event_type, data):
+        """
+        Publish an event once the current transaction commits.
+
+        Args:
+            event_type (str): The event name, e.g. "socialpost".
+            data (dict): The serialized object.
+        """
+        event = {"type": event_type, "data": data}
+        transaction.on_commit(lambda: self.backend.publish(event))
+
+    def deliver(self, event):
+        """
+        Hand an event to every subscription of this process, from any thread.
+
+        Args:
+            event (dict): The event.
+        """
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.put, event)
+            except RuntimeError:
+                # The loop of a disconnected stream is closed
+                self.unsubscribe(subscription)
+
+
+class LocalBackend:
+    """
+    Delivers events to the streams of the publishing process only.
+    """
+
+    def __init__(self, deliver):
+        self.deliver = deliver
+
+    def start(self):
+        pass
+
+    def publish(self, event):
+        self.deliver(event)
+
+
+class CacheBackend(LocalBackend):
+    """
+    Relays events between processes through the posts cache.
+
+    Published events are numbered with a shared counter and stored for a
+    minute. A single thread per process polls the counter and delivers the
+    new events in order, so the cost of waiting does not grow with the number
+    of streams. The posts cache must be shared between the processes, e.g.
+    the Redis backend.
+
+    An event is numbered before it is stored, so a poll can see a number
+    whose event is not there yet. Polling stops at such a gap and retries it
+    until the event would have expired, then skips it.
+    """
+
+    SEQUENCE = "events:sequence"
+    TIMEOUT = 60
+
+    def __init__(self, deliver):
+        super().__init__(deliver)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self.poll, daemon=True)
+                self._thread.start()
+
+    def publish(self, event):
+        cache = get_cache()
+        try:
+            sequence = cache.incr(self.SEQUENCE)
+        except ValueError:
+            cache.add(self.SEQUENCE, 0, None)
+            sequence = cache.incr(self.SEQUENCE)
+        cache.set(f"events:{sequence}", event, self.TIMEOUT)
+
+    def poll(self):
+        cache = get_cache()
+        last = cache.get(self.SEQUENCE, 0)
+        # When the missing events were first looked for, by number
+        missing = {}
+        while True:
+            time.sleep(settings.EVENTS_POLL_INTERVAL)
+            try:
+                sequence = cache.get(self.SEQUENCE, 0)
+                if sequence < last:
+                    # The counter was evicted and started over
+                    last = 0
+                    missing.clear()
+
+                numbers = range(last + 1, sequence + 1)
+                found = cache.get_many([f"events:{number}" for number in numbers])
+                now = time.monotonic()
+                for number in numbers:
+                    if f"events:{number}" not in found:
+                        missing.setdefault(number, now)
+
+                for number in numbers:
+                    event = found.get(f"events:{number}")
+                    if event is None and now - missing[number] < self.TIMEOUT:
+                        break
+                    if event is not None:
+                        self.deliver(event)
+                    missing.pop(number, None)
+                    last = number
+            except Exception:
+                # Keep polling through cache outages
+                continue
+
+
+def format_event(event):
+    """
+    Encode an event in the server-sent events format.
+
+    Args:
+        event (dict): The event.
+
+    Returns:
+        str: The event message.
+    """
+    data = json.dumps(event["data"], cls=DjangoJSONEncoder)
+    return f"event: {event['type']}\ndata: {data}\n\n"
+
+
+events = EventBroker(settings.EVENTS_BACKEND, settings.SSE_QUEUE_SIZE)
@@ -0,0 +1,146 @@
+from xml.sax.saxutils import escape, quoteattr
+
+from django.conf import settings
+from django.utils.feedgenerator import rfc2822_date, rfc3339_date
+from django.utils.html import strip_tags
+
+from api.utils.cache import set_cached
+
+SITE_TITLE = "The Clean Cooking Association Kenya"
+
+# Sitemaps may list at most 50,000 URLs
+SITEMAP_LIMIT = 50000
+
+
+def post_url(post):
+    return settings.FEED_SITE_URL + settings.FEED_POST_PATH.format(
+        id=post.pk, category=post.category
+    )
+
+
+def author_name(post):
+    if post.created_by:
+        return f"{post.created_by.first_name} {post.created_by.last_name}"
+    return post.author or SITE_TITLE
+
+
+def feed_title(category):
+    return f"{SITE_TITLE} - {category.title()}" if category else SITE_TITLE
+
+
+def rss_chunks(posts, category, feed_url):
+    """
+    Render posts as an RSS 2.0 feed, one item at a time.
+
+    Args:
+        posts (iterable): The posts, newest first.
+        category (str): The category of the feed, if any.
+        feed_url (str): The absolute URL of the feed.
+
+    Yields:
+        str: The parts of the feed document.
+    """
+    yield (
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        '<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom"><channel>'
+        f"<title>{escape(feed_title(category))}</title>"
+        f"<link>{escape(settings.FEED_SITE_URL or feed_url)}</link>"
+        f"<description>{escape(feed_title(category))}</description>"
+        f'<atom:link href={quoteattr(feed_url)} rel="self"/>'
+    )
+    for post in posts:
+        link = escape(post_url(post))
+        yield (
+            "<item>"
+            f"<title>{escape(post.title)}</title>"
+            f"<link>{link}</link>"
+            f"<description>{escape(strip_tags(post.excerpt))}</description>"
+            f"<category>{escape(post.category)}</category>"
+            f"<pubDate>{rfc2822_date(post.published)}</pubDate>"
+            f'<guid isPermaLink="true">{link}</guid>'
+            "</item>"
+        )
+    yield "</channel></rss>\n"
+
+
+def atom_chunks(posts, category, feed_url, updated):
+    """
+    Render posts as an Atom 1.0 feed, one entry at a time.
+
+    Args:
+        posts (iterable): The posts, newest first.
+        category (str): The category of the feed, if any.
+        feed_url (str): The absolute URL of the feed.
+        updated (datetime): The last update of any post in the feed.
+
+    Yields:
+        str: The parts of the feed document.
+    """
+    yield (
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        '<feed xmlns="http://www.w3.org/2005/Atom">'
+        f"<title>{escape(feed_title(category))}</title>"
+        f"<id>{escape(feed_url)}</id>"
+        f'<link href={quoteattr(feed_url)} rel="self"/>'
+        f"<link href={quoteattr(settings.FEED_SITE_URL or feed_url)}/>"
+        f"<updated>{rfc3339_date(updated)}</updated>"
+    )
+    for post in posts:
+        link = quoteattr(post_url(post))
+        yield (
+            "<entry>"
+            f"<title>{escape(post.title)}</title>"
+            f"<link href={link}/>"
+            f"<id>{escape(post_url(post))}</id>"
+            f"<published>{rfc3339_date(post.published)}</published>"
+            f"<updated>{rfc3339_date(post.last_updated)}</updated>"
+            f"<summary>{escape(strip_tags(post.excerpt))}</summary>"
+            f"<category term={quoteattr(post.category)}/>"
+            f"<author><name>{escape(author_name(post))}</name></author>"
+            "</entry>"
+        )
+    yield "</feed>\n"
+
+
+def sitemap_chunks(posts):
+    """
+    Render the URLs of posts as an XML sitemap.
+
+    Args:
+        posts (iterable): The posts.
+
+    Yields:
+        str: The parts of the sitemap document.
+    """
+    yield (
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+    )
+    for post in posts:
+        yield (
+            "<url>"
+            f"<loc>{escape(post_url(post))}</loc>"
+            f"<lastmod>{post.last_updated.date().isoformat()}</lastmod>"
+            "</url>"
+        )
+    yield "</urlset>\n"
+
+
+def cache_stream(chunks, key, timeout):
+    """
+    Stream encoded chunks and cache the complete body once the last one is sent.
+
+    Args:
+        chunks (iterable): The parts of the document.
+        key (str): The cache key of the body.
+        timeout (int): The cache timeout in seconds.
+
+    Yields:
+        bytes: The encoded parts of the document.
+    """
+    parts = []
+    for chunk in chunks:
+        data = chunk.encode()
+        parts.append(data)
+        yield data
+    set_cached(key, b"".join(parts), timeout)
@@ -0,0 +1,151 @@
+from django.db import transaction
+from django.utils import timezone
+
+
+def extract_files(files):
+    """
+    Collect the file entries stored in the JSON files of a post.
+
+    Args:
+        files: The files value as stored on the post, {"data": [...]} or a list.
+
+    Returns:
+        dict: The file entries keyed by file ID, in order, first entry wins.
+    """
+    if isinstance(files, dict):
+        files = files.get("data", [])
+    if not isinstance(files, (list, tuple)):
+        return {}
+
+    entries = {}
+    for entry in files:
+        if isinstance(entry, dict) and entry.get("file_id"):
+            entries.setdefault(str(entry["file_id"]), entry)
+    return entries
+
+
+def sync_post_files(post):
+    """
+    Bring the file rows of a post in line with its JSON files.
+
+    Args:
+        post (Post): The saved post.
+    """
+    from api.models.file import PostFile
+
+    entries = extract_files(post.files)
+    existing = {row.file_id: row for row in PostFile.objects.filter(post=post)}
+
+    removed = set(existing) - set(entries)
+    if removed:
+        PostFile.objects.filter(post=post, file_id__in=removed).delete()
+
+    created = []
+    changed = []
+    for position, (file_id, entry) in enumerate(entries.items()):
+        row = existing.get(file_id)
+        if row is None:
+            created.append(
+                PostFile(post=post, file_id=file_id, position=position, data=entry)
+            )
+        elif row.position != position or row.data != entry:
+            row.position = position
+            row.data = entry
+            changed.append(row)
+
+    PostFile.objects.bulk_create(created)
+    PostFile.objects.bulk_update(changed, ["position", "data"])
+
+
+def write_post_files(post_id):
+    """
+    Rewrite the JSON files of a post from its file rows.
+
+    The post is updated in place without calling save(), the rows already
+    hold the result.
+
+    Args:
+        post_id (int): The ID of the post.
+
+    Returns:
+        dict: The new files value of the post.
+    """
+    from api.models.file import PostFile
+    from api.models.post import Post
+
+    files = {
+        "data": list(
+            PostFile.objects.filter(post_id=post_id)
+            .order_by("position", "id")
+            .values_list("data", flat=True)
+        )
+    }
+    Post.objects.filter(pk=post_id).update(files=files, last_updated=timezone.now())
+    return files
+
+
+def attach_files(post_id, entries):
+    """
+    Attach files to a post, replacing the entries of files already attached.
+
+    Args:
+        post_id (int): The ID of the post.
+        entries (list): The file entries, each holding a file_id.
+
+    Returns:
+        dict: The new files value of the post.
+    """
+    from api.models.file import PostFile
+
+    entries = extract_files(entries)
+    with transaction.atomic():
+        existing = {
+            row.file_id: row
+            for row in PostFile.objects.select_for_update().filter(
+                post_id=post_id, file_id__in=list(entries)
+            )
+        }
+        position = (
+            PostFile.objects.filter(post_id=post_id)
+            .order_by("-position")
+            .values_list("position", flat=True)
+            .first()
+        )
+        position = -1 if position is None else position
+
+        created = []
+        for file_id, entry in entries.items():
+            row = existing.get(file_id)
+            if row is None:
+                position += 1
+                created.append(
+                    PostFile(
+                        post_id=post_id, file_id=file_id, position=position, data=entry
+                    )
+                )
+            else:
+                row.data = entry
+
+        PostFile.objects.bulk_create(created)
+        PostFile.objects.bulk_update(list(existing.values()), ["data"])
+        return write_post_files(post_id)
+
+
+def detach_files(post_id, file_ids):
+    """
+    Detach files from a post.
+
+    Args:
+        post_id (int): The ID of the post.
+        file_ids (list): The IDs of the files to detach.
+
+    Returns:
+        dict: The new files value of the post.
+    """
+    from api.models.file import PostFile
+
+    with transaction.atomic():
+        PostFile.objects.filter(
+            post_id=post_id, file_id__in=[str(file_id) for file_id in file_ids]
+        ).delete()
+        return write_post_files(post_id)
@@ -0,0 +1,94 @@
+import datetime
+
+from django.utils.html import strip_tags
+
+PRODUCT_ID = "-//CCAK//Events//EN"
+
+
+def escape_text(value):
+    """
+    Escape a TEXT property value as required by RFC 5545.
+
+    Args:
+        value (str): The raw text.
+
+    Returns:
+        str: The escaped text.
+    """
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def fold_line(line):
+    """
+    Fold a content line into chunks of at most 75 octets.
+
+    Args:
+        line (str): The unfolded content line.
+
+    Returns:
+        str: The folded line, continuation lines starting with a space.
+    """
+    chunks = []
+    chunk = ""
+    size = 0
+    for char in line:
+        width = len(char.encode())
+        if size + width > 75:
+            chunks.append(chunk)
+            chunk = " "
+            size = 1
+        chunk += char
+        size += width
+    chunks.append(chunk)
+    return "\r\n".join(chunks)
+
+
+def format_datetime(value):
+    return value.astimezone(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def build_calendar(events, domain):
+    """
+    Render event posts as an iCalendar VCALENDAR.
+
+    Args:
+        events (iterable): The event posts.
+        domain (str): The domain used to make the event UIDs globally unique.
+
+    Returns:
+        str: The calendar, with CRLF line endings.
+    """
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODUCT_ID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        "X-WR-CALNAME:CCAK Events",
+    ]
+
+    for event in events:
+        lines += [
+            "BEGIN:VEVENT",
+            f"UID:post-{event.pk}@{domain}",
+            f"DTSTAMP:{format_datetime(event.last_updated)}",
+            f"DTSTART:{format_datetime(event.event_date)}",
+            f"SUMMARY:{escape_text(event.title)}",
+        ]
+        if event.excerpt:
+            lines.append(f"DESCRIPTION:{escape_text(strip_tags(event.excerpt))}")
+        if event.venue:
+            lines.append(f"LOCATION:{escape_text(event.venue)}")
+        if event.venue_link:
+            lines.append(f"URL:{event.venue_link}")
+        lines.append("END:VEVENT")
+
+    lines.append("END:VCALENDAR")
+    return "".join(f"{fold_line(line)}\r\n" for line in lines)
@@ -0,0 +1,23 @@
+from api.models.like import Like
+
+
+def liked_by(user, socialpost_ids):
+    """
+    Find which of the given socialposts a member has liked, with one query.
+
+    Args:
+        user: The authenticated user.
+        socialpost_ids (list): The IDs of the socialposts to check.
+
+    Returns:
+        set: The IDs of the socialposts the member liked, empty for anyone
+        but a member.
+    """
+    if getattr(user, "user_type", None) != "member" or not socialpost_ids:
+        return set()
+
+    return set(
+        Like.objects.filter(member=user, socialpost_id__in=socialpost_ids).values_list(
+            "socialpost_id", flat=True
+        )
+    )
@@ -0,0 +1,23 @@
+from django.db import connection
+from django.db.models import F
+
+
+def select_for_update(queryset):
+    """
+    Lock the rows of a queryset until the end of the current transaction.
+
+    SQLite ignores SELECT ... FOR UPDATE, and a transaction that reads before
+    it writes fails with "database is locked" when another connection writes
+    in between instead of waiting. On SQLite the rows are therefore written
+    back unchanged first, which takes the database write lock up front.
+
+    Args:
+        queryset (QuerySet): The rows to lock, inside transaction.atomic().
+
+    Returns:
+        QuerySet: The queryset selecting the locked rows.
+    """
+    if connection.vendor == "sqlite":
+        pk = queryset.model._meta.pk.name
+        queryset.update(**{pk: F(pk)})
+    return queryset.select_for_update()
@@ -0,0 +1,159 @@
+import base64
+import binascii
+import datetime
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.response import Response
+
+
+class KeysetPagination:
+    """
+    Cursor pagination over an arbitrary multi-column ordering.
+
+    The cursor is an opaque token holding the ordering values of the last row
+    of a page. The next page is fetched with a WHERE clause on those values
+    instead of an OFFSET, so every page costs the same and no COUNT query is
+    needed. The ordering must end with a unique column such as `-id`.
+
+    In newer mode the rows that sort before a cursor are returned instead,
+    which lets a client poll for rows added to the top of a feed.
+
+    A page size that is not a positive integer raises ValueError.
+    """
+
+    def __init__(self, ordering, page_size):
+        self.ordering = ordering
+        try:
+            self.page_size = int(page_size)
+        except (TypeError, ValueError):
+            raise ValueError("Invalid limit.")
+        if self.page_size < 1:
+            raise ValueError("Invalid limit.")
+        self.next_cursor = None
+        self.newer_cursor = None
+        self.has_more = False
+
+    def paginate_queryset(self, queryset, cursor=None):
+        """
+        Return the page of rows that follows the given cursor.
+
+        Args:
+            queryset (QuerySet): The queryset to paginate, annotated with any
+                non-model fields named in the ordering.
+            cursor (str): The token returned with the previous page, if any.
+
+        Returns:
+            list: The rows of the page.
+
+        Raises:
+            ValueError: If the cursor is not a valid token for this ordering.
+        """
+        queryset = queryset.order_by(*self.ordering)
+
+        if cursor:
+            try:
+                queryset = queryset.filter(self.after(self.decode(cursor)))
+            except (ValidationError, TypeError):
+                raise ValueError("Invalid cursor.")
+
+        rows = list(queryset[: self.page_size + 1])
+        self.has_more = len(rows) > self.page_size
+        if self.has_more:
+            rows = rows[: self.page_size]
+            self.next_cursor = self.encode(rows[-1])
+        else:
+            self.next_cursor = None
+        self.newer_cursor = self.encode(rows[0]) if rows else cursor
+
+        return rows
+
+    def paginate_newer(self, queryset, cursor):
+        """
+        Return the rows that sort before the given cursor, closest first.
+
+        At most a page of rows is returned, in the regular ordering. When more
+        rows are newer, `has_more` is set and polling again with the new
+        `newer_cursor` returns the next ones.
+
+        Args:
+            queryset (QuerySet): The queryset to paginate.
+            cursor (str): The token of the newest row the client has.
+
+        Returns:
+            list: The rows of the page.
+
+        Raises:
+            ValueError: If the cursor is not a valid token for this ordering.
+        """
+        reverse = [
+            field[1:] if field.startswith("-") else f"-{field}"
+            for field in self.ordering
+        ]
+        try:
+            queryset = queryset.order_by(*reverse).filter(
+                self.after(self.decode(cursor), reverse=True)
+            )
+        except (ValidationError, TypeError):
+            raise ValueError("Invalid cursor.")
+
+        rows = list(queryset[: self.page_size + 1])
+        self.has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        rows.reverse()
+
+        self.next_cursor = None
+        self.newer_cursor = self.encode(rows[0]) if rows else cursor
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.next_cursor, "results": data})
+
+    def keys(self):
+        return [(field.lstrip("-"), field.startswith("-")) for field in self.ordering]
+
+    def after(self, values, reverse=False):
+        """
+        Build the filter selecting rows that sort after the given values.
+
+        Args:
+            values (list): The ordering values of the last row seen.
+            reverse (bool): Select the rows that sort before them instead.
+
+        Returns:
+            Q: The keyset filter.
+        """
+        query = Q()
+        equal = Q()
+
+        for (field, descending), value in zip(self.keys(), values):
+            lookup = "lt" if descending != reverse else "gt"
+            query |= equal & Q(**{f"{field}__{lookup}": value})
+            equal &= Q(**{field: value})
+
+        return query
+
+    def encode(self, row):
+        values = []
+        for field, _ in self.keys():
+            value = getattr(row, field)
+            if isinstance(value, datetime.datetime):
+                value = value.isoformat()
+            values.append(value)
+
+        token = json.dumps(values, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(token).decode()
+
+    def decode(self, cursor):
+        if not isinstance(cursor, str):
+            raise ValueError("Invalid cursor.")
+
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (binascii.Error, ValueError, UnicodeError):
+            raise ValueError("Invalid cursor.")
+
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise ValueError("Invalid cursor.")
+        return values
@@ -0,0 +1,25 @@
+def only_serialized_fields(queryset, serializer_class, *extra):
+    """
+    Restrict a queryset to the columns a serializer actually outputs.
+
+    The model fields are derived from the serializer's declared fields, so
+    large columns the serializer leaves out (post content, member passwords and
+    JSON blobs) are never loaded for list responses.
+
+    Args:
+        queryset (QuerySet): The queryset to restrict.
+        serializer_class (Serializer): The model serializer used for the response.
+        extra (str): Additional fields to load, e.g. columns of joined relations.
+
+    Returns:
+        QuerySet: The queryset loading only the serialized columns.
+    """
+    model_fields = {field.name for field in queryset.model._meta.concrete_fields}
+
+    columns = []
+    for field in serializer_class().fields.values():
+        source = field.source.split(".")[0]
+        if source in model_fields and source not in columns:
+            columns.append(source)
+
+    return queryset.only(*columns, *extra)
@@ -0,0 +1,419 @@
+import math
+import re
+import threading
+from collections import Counter
+
+import numpy as np
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, Min
+
+from api.models.post import Post
+from api.models.related import RelatedPost
+from api.utils.tags import extract_tags
+
+TOKEN_RE = re.compile(r"[^\W\d_]{3,}")
+TAG_RE = re.compile(r"<[^>]+>")
+
+STOP_WORDS = {
+    "and",
+    "are",
+    "but",
+    "can",
+    "for",
+    "from",
+    "has",
+    "have",
+    "into",
+    "its",
+    "not",
+    "our",
+    "than",
+    "that",
+    "the",
+    "their",
+    "them",
+    "there",
+    "these",
+    "they",
+    "this",
+    "was",
+    "were",
+    "will",
+    "with",
+    "you",
+    "your",
+    "which",
+    "who",
+    "also",
+    "been",
+    "more",
+    "all",
+    "about",
+    "such",
+    "other",
+    "his",
+    "her",
+}
+
+# Term weights of the post fields, the title counts most
+FIELD_WEIGHTS = [("title", 3), ("tags", 2), ("excerpt", 1), ("content", 1)]
+
+# Post fields the related posts are computed from
+RELATED_SOURCE_FIELDS = ["title", "tags", "excerpt", "content", "status"]
+
+
+def tokenize(text):
+    return [word for word in TOKEN_RE.findall(text.lower()) if word not in STOP_WORDS]
+
+
+def post_terms(post):
+    """
+    Count the weighted terms of a post.
+
+    Args:
+        post (dict): The post values holding title, excerpt, tags and content.
+
+    Returns:
+        Counter: The term frequencies, with title and tag terms weighted up.
+    """
+    texts = {
+        "title": post["title"],
+        "tags": " ".join(extract_tags(post["tags"])),
+        "excerpt": post["excerpt"],
+        "content": TAG_RE.sub(" ", post["content"]),
+    }
+
+    terms = Counter()
+    for field, weight in FIELD_WEIGHTS:
+        for word in tokenize(texts[field]):
+            terms[word] += weight
+    return terms
+
+
+class TermMatrix:
+    """
+    A sparse float32 matrix of TF-IDF rows.
+
+    Only the terms a post contains are stored, once by row and once by term,
+    so memory grows with the text of the posts instead of with the number of
+    posts times the vocabulary size, and a similarity only visits the posts
+    sharing a term with the compared one.
+    """
+
+    def __init__(self, rows, columns, values, shape):
+        self.shape = shape
+        order = np.lexsort((columns, rows))
+        self.row_pointers = np.searchsorted(rows[order], np.arange(shape[0] + 1))
+        self.row_columns = columns[order]
+        self.row_values = values[order]
+
+        order = np.argsort(columns, kind="stable")
+        self.column_pointers = np.searchsorted(columns[order], np.arange(shape[1] + 1))
+        self.column_rows = rows[order]
+        self.column_values = values[order]
+
+    def similarities(self, row):
+        """
+        Compute the dot products of a row with every row.
+
+        The entries of the row's terms are gathered from the term lists in
+        one pass and summed per row.
+
+        Args:
+            row (int): The row number.
+
+        Returns:
+            ndarray: The dot product with each row.
+        """
+        start, end = self.row_pointers[row], self.row_pointers[row + 1]
+        columns = self.row_columns[start:end]
+        firsts = self.column_pointers[columns]
+        lengths = self.column_pointers[columns + 1] - firsts
+
+        # The positions of the entries of every term, one range after another
+        offsets = np.repeat(firsts - np.cumsum(lengths) + lengths, lengths)
+        entries = offsets + np.arange(lengths.sum())
+        products = (
+            np.repeat(self.row_values[start:end], lengths) * self.column_values[entries]
+        )
+        return np.bincount(
+            self.column_rows[entries], weights=products, minlength=self.shape[0]
+        )
+
+
+def vectorize():
+    """
+    Build the TF-IDF matrix of every published post.
+
+    Term frequencies are dampened with 1 + log(tf), the vocabulary is capped
+    to the most common terms and every row is L2 normalized, so the dot
+    product of two rows is their cosine similarity.
+
+    Returns:
+        tuple: The array of post IDs and the matching TermMatrix.
+    """
+    posts = Post.objects.filter(status="published").values(
+        "id", "title", "excerpt", "tags", "content"
+    )
+
+    ids = []
+    documents = []
+    for post in posts.iterator():
+        ids.append(post["id"])
+        documents.append(post_terms(post))
+
+    document_frequency = Counter()
+    for terms in documents:
+        document_frequency.update(terms.keys())
+
+    vocabulary = {
+        term: index
+        for index, (term, _) in enumerate(
+            document_frequency.most_common(settings.RELATED_POSTS_MAX_FEATURES)
+        )
+    }
+
+    count = len(documents)
+    idf = np.zeros(len(vocabulary), dtype=np.float32)
+    for term, index in vocabulary.items():
+        idf[index] = math.log((1 + count) / (1 + document_frequency[term])) + 1
+
+    rows, columns, values = [], [], []
+    for row, terms in enumerate(documents):
+        for term, frequency in terms.items():
+            column = vocabulary.get(term)
+            if column is not None:
+                rows.append(row)
+                columns.append(column)
+                values.append(1 + math.log(frequency))
+    documents = None
+
+    rows = np.array(rows, dtype=np.int32)
+    columns = np.array(columns, dtype=np.int32)
+    values = np.array(values, dtype=np.float32) * idf[columns]
+    norms = np.sqrt(np.bincount(rows, weights=values**2, minlength=count))
+    norms[norms == 0] = 1
+    values /= norms[rows].astype(np.float32)
+
+    matrix = TermMatrix(rows, columns, values, (count, len(vocabulary)))
+    return np.array(ids, dtype=np.int64), matrix
+
+
+def nearest(ids, matrix, rows):
+    """
+    Compute the top-k most similar posts for the given matrix rows.
+
+    The top-k of each row is selected with argpartition instead of a full
+    sort.
+
+    Args:
+        ids (ndarray): The post IDs of the matrix rows.
+        matrix (TermMatrix): The normalized TF-IDF matrix.
+        rows (list): The row numbers to compute neighbours for.
+
+    Returns:
+        dict: Lists of (related post ID, score) keyed by post ID.
+    """
+    k = min(settings.RELATED_POSTS_COUNT, len(ids) - 1)
+    neighbours = {}
+    if k <= 0:
+        return {int(ids[row]): [] for row in rows}
+
+    for row in rows:
+        scores = matrix.similarities(row)
+        scores[row] = -1
+
+        top = np.argpartition(-scores, k - 1)[:k]
+        columns = top[np.argsort(-scores[top])]
+        neighbours[int(ids[row])] = [
+            (int(ids[column]), float(scores[column]))
+            for column in columns
+            if scores[column] > 0
+        ]
+
+    return neighbours
+
+
+def store(neighbours):
+    with transaction.atomic():
+        # Posts deleted since the matrix was built are left out
+        existing = set(Post.objects.values_list("id", flat=True))
+        RelatedPost.objects.filter(post_id__in=list(neighbours)).delete()
+        RelatedPost.objects.bulk_create(
+            [
+                RelatedPost(post_id=post_id, related_id=related_id, score=score)
+                for post_id, related in neighbours.items()
+                if post_id in existing
+                for related_id, score in related
+                if related_id in existing
+            ],
+            batch_size=500,
+        )
+
+
+def refresh_related_posts():
+    """
+    Recompute the related posts of every published post.
+
+    Returns:
+        int: The number of posts processed.
+    """
+    ids, matrix = vectorize()
+
+    with transaction.atomic():
+        RelatedPost.objects.exclude(post_id__in=ids.tolist()).delete()
+        store(nearest(ids, matrix, list(range(len(ids)))))
+
+    return len(ids)
+
+
+def refresh_posts(post_ids, related_ids=()):
+    """
+    Update the related posts after posts were created, updated or deleted.
+
+    The written posts get their own neighbours recomputed, and so does every
+    post that listed one of them before or that one of them would now enter
+    the top-k of. The matrix is built once for all the posts.
+
+    Args:
+        post_ids (list): The IDs of the written posts.
+        related_ids (list): The IDs of other posts whose lists to recompute,
+            e.g. the posts that listed a deleted post.
+    """
+    post_ids = {int(post_id) for post_id in post_ids}
+    affected = {int(post_id) for post_id in related_ids}
+    affected.update(
+        RelatedPost.objects.filter(related_id__in=post_ids).values_list(
+            "post_id", flat=True
+        )
+    )
+    if not post_ids and not affected:
+        return
+
+    ids, matrix = vectorize()
+    rows = {int(pk): row for row, pk in enumerate(ids)}
+
+    # Posts that are no longer published keep no related posts
+    RelatedPost.objects.filter(post_id__in=post_ids | affected).exclude(
+        post_id__in=list(rows)
+    ).delete()
+
+    written = [post_id for post_id in post_ids if post_id in rows]
+    if written:
+        affected.update(written)
+        lists = {
+            item["post"]: item
+            for item in RelatedPost.objects.values("post").annotate(
+                lowest=Min("score"), count=Count("id")
+            )
+        }
+        scores = np.zeros(len(ids), dtype=np.float32)
+        for post_id in written:
+            np.maximum(scores, matrix.similarities(rows[post_id]), out=scores)
+        for other, other_row in rows.items():
+            if other in affected or scores[other_row] <= 0:
+                continue
+            current = lists.get(other)
+            if (
+                current is None
+                or current["count"] < settings.RELATED_POSTS_COUNT
+                or scores[other_row] > current["lowest"]
+            ):
+                affected.add(other)
+
+    store(nearest(ids, matrix, [rows[post] for post in affected if post in rows]))
+
+
+class RelatedRefresher:
+    """
+    Refreshes related posts in the background after posts were written.
+
+    Requests only record the posts they wrote once their transaction commits.
+    A single worker thread per process takes every pending post at once, so
+    a burst of writes costs one refresh instead of one per request, and none
+    of them waits for the matrix to be built.
+    """
+
+    def __init__(self):
+        self._posts = set()
+        self._related = set()
+        self._lock = threading.Lock()
+        self._running = False
+
+    def schedule(self, post_ids=(), related_ids=()):
+        """
+        Refresh the related posts once the current transaction commits, in
+        the background unless RELATED_POSTS_ASYNC is off.
+
+        Args:
+            post_ids (list): The IDs of the written posts.
+            related_ids (list): The IDs of other posts whose lists to recompute.
+        """
+        post_ids = list(post_ids)
+        related_ids = list(related_ids)
+        if not post_ids and not related_ids:
+            return
+
+        def start():
+            if not settings.RELATED_POSTS_ASYNC:
+                refresh_posts(post_ids, related_ids)
+                return
+
+            with self._lock:
+                self._posts.update(post_ids)
+                self._related.update(related_ids)
+                if self._running:
+                    return
+                self._running = True
+            threading.Thread(target=self.run, daemon=True).start()
+
+        transaction.on_commit(start)
+
+    def run(self):
+        try:
+            while True:
+                with self._lock:
+                    posts, self._posts = self._posts, set()
+                    related, self._related = self._related, set()
+                    if not posts and not related:
+                        self._running = False
+                        return
+                try:
+                    self.refresh(posts, related)
+                except Exception:
+                    # Retry with the next batch of writes
+                    with self._lock:
+                        self._posts.update(posts)
+                        self._related.update(related)
+                        self._running = False
+                    raise
+        finally:
+            connection.close()
+
+    def refresh(self, posts, related):
+        for attempt in range(3):
+            try:
+                return refresh_posts(posts, related)
+            except IntegrityError:
+                # A post was deleted while the lists were stored, retry
+                if attempt == 2:
+                    raise
+
+
+def related_to(post_id):
+    """
+    Return the IDs of the posts listing a post among their related posts.
+
+    Args:
+        post_id (int): The ID of the post.
+
+    Returns:
+        list: The IDs of the posts that list it.
+    """
+    return list(
+        RelatedPost.objects.filter(related_id=post_id).values_list("post_id", flat=True)
+    )
+
+
+related_refresher = RelatedRefresher()
@@ -0,0 +1,174 @@
+import hashlib
+import json
+import re
+import zlib
+from difflib import SequenceMatcher
+
+from django.db import IntegrityError, transaction
+from django.db.models import Max
+
+# Post fields kept in the revision history
+REVISION_FIELDS = ["title", "excerpt", "content"]
+
+TOKEN_RE = re.compile(r"\s+|[^\s<>]+|<[^>]*>?|[<>]")
+
+
+def tokenize(text):
+    """
+    Split text into words, runs of whitespace and HTML tags, so diffs follow
+    the edits of a document rather than its lines.
+    """
+    return TOKEN_RE.findall(text or "")
+
+
+def make_diff(new, old):
+    """
+    Compute the edits turning the new text back into the old one.
+
+    Args:
+        new (str): The text after the edit.
+        old (str): The text before the edit.
+
+    Returns:
+        list: [start, end, replacement] edits on the tokens of the new text.
+    """
+    new_tokens = tokenize(new)
+    old_tokens = tokenize(old)
+
+    # Most edits touch one place, only match the tokens between the common
+    # prefix and suffix
+    start = 0
+    limit = min(len(new_tokens), len(old_tokens))
+    while start < limit and new_tokens[start] == old_tokens[start]:
+        start += 1
+    end = 0
+    while end < limit - start and new_tokens[-end - 1] == old_tokens[-end - 1]:
+        end += 1
+
+    matcher = SequenceMatcher(
+        None,
+        new_tokens[start : len(new_tokens) - end],
+        old_tokens[start : len(old_tokens) - end],
+    )
+    return [
+        [start + i1, start + i2, "".join(old_tokens[start + j1 : start + j2])]
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        if tag != "equal"
+    ]
+
+
+def checksum(text):
+    """
+    Fingerprint the text a diff applies to.
+    """
+    return hashlib.sha1((text or "").encode()).hexdigest()
+
+
+def apply_diff(text, edits):
+    """
+    Apply the edits of make_diff to the new text.
+
+    Args:
+        text (str): The text after the edit.
+        edits (list): The edits returned by make_diff.
+
+    Returns:
+        str: The text before the edit.
+    """
+    tokens = tokenize(text)
+    parts = []
+    position = 0
+    for start, end, replacement in edits:
+        parts.extend(tokens[position:start])
+        parts.append(replacement)
+        position = end
+    parts.extend(tokens[position:])
+    return "".join(parts)
+
+
+def record_revision(post, previous, author=None):
+    """
+    Record a revision after a post was saved, when a tracked field changed.
+
+    The checksums of the saved fields are stored with the diffs, so a later
+    write that bypassed the history is detected instead of corrupting the
+    rebuilt revisions.
+
+    Args:
+        post (Post): The saved post.
+        previous (dict): The saved tracked fields, with their values before
+            the save.
+        author (Administrator): The administrator who saved the post.
+
+    Returns:
+        PostRevision: The new revision, or None when no tracked field changed.
+    """
+    from api.models.revision import PostRevision
+
+    diffs = {
+        field: make_diff(getattr(post, field), value)
+        for field, value in previous.items()
+        if getattr(post, field) != value
+    }
+    if not diffs:
+        return None
+
+    diff = zlib.compress(json.dumps(diffs, separators=(",", ":")).encode())
+    for attempt in range(3):
+        number = (
+            PostRevision.objects.filter(post=post).aggregate(last=Max("number"))["last"]
+            or 0
+        ) + 1
+        try:
+            with transaction.atomic():
+                return PostRevision.objects.create(
+                    post=post,
+                    number=number,
+                    diff=diff,
+                    size=len(diff),
+                    changed_fields=list(diffs),
+                    checksums={
+                        field: checksum(getattr(post, field)) for field in diffs
+                    },
+                    created_by=author,
+                )
+        except IntegrityError:
+            # Another save took the number, retry with the next one
+            if attempt == 2:
+                raise
+
+
+def revision_fields(post, number):
+    """
+    Rebuild the tracked fields of a post as saved by a revision.
+
+    Only the diffs of the revisions newer than the requested one are read and
+    decompressed, newest first.
+
+    Args:
+        post (Post): The post, holding the latest field values.
+        number (int): The revision number, 0 for the post before its first
+            recorded revision.
+
+    Returns:
+        dict: The tracked field values.
+
+    Raises:
+        ValueError: If a field was changed without recording a revision, so
+            the diffs no longer apply.
+    """
+    from api.models.revision import PostRevision
+
+    fields = {field: getattr(post, field) for field in REVISION_FIELDS}
+    diffs = (
+        PostRevision.objects.filter(post=post, number__gt=number)
+        .order_by("-number")
+        .values_list("diff", "checksums")
+    )
+    for diff, checksums in diffs.iterator():
+        for field, edits in json.loads(zlib.decompress(diff)).items():
+            # Revisions recorded before checksums were stored are not checked
+            if field in checksums and checksums[field] != checksum(fields[field]):
+                raise ValueError("The post was changed outside its revisions.")
+            fields[field] = apply_diff(fields[field], edits)
+    return fields
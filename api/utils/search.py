@@ -0,0 +1,236 @@
+import re
+from html import unescape
+
+from django.db import connection
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.utils.html import strip_tags
+
+from api.utils.tags import extract_tags
+
+INDEXED_FIELDS = ["title", "excerpt", "content", "tags"]
+
+SQLITE_INDEX_TABLE = "api_post_fts"
+POSTGRES_INDEX_TABLE = "api_post_search"
+
+
+def create_index(schema_editor):
+    """
+    Create the full-text index table for posts on the current database backend.
+
+    SQLite uses an FTS5 virtual table keyed by the post id (rowid), PostgreSQL
+    uses a table of weighted tsvector documents behind a GIN index. Other
+    backends have no index and fall back to plain LIKE lookups.
+
+    Args:
+        schema_editor: The schema editor of the running migration.
+    """
+    vendor = schema_editor.connection.vendor
+
+    if vendor == "sqlite":
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_INDEX_TABLE} "
+            "USING fts5(title, excerpt, content, tags, tokenize='porter unicode61')"
+        )
+    elif vendor == "postgresql":
+        schema_editor.execute(
+            f"CREATE TABLE IF NOT EXISTS {POSTGRES_INDEX_TABLE} "
+            "(post_id bigint PRIMARY KEY, document tsvector NOT NULL)"
+        )
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {POSTGRES_INDEX_TABLE}_document_idx "
+            f"ON {POSTGRES_INDEX_TABLE} USING GIN (document)"
+        )
+
+
+def drop_index(schema_editor):
+    """
+    Drop the full-text index table created by create_index.
+
+    Args:
+        schema_editor: The schema editor of the running migration.
+    """
+    vendor = schema_editor.connection.vendor
+
+    if vendor == "sqlite":
+        schema_editor.execute(f"DROP TABLE IF EXISTS {SQLITE_INDEX_TABLE}")
+    elif vendor == "postgresql":
+        schema_editor.execute(f"DROP TABLE IF EXISTS {POSTGRES_INDEX_TABLE}")
+
+
+def tags_text(tags):
+    """
+    Flatten the JSON tags of a post into a single space separated string.
+
+    Args:
+        tags: The tags value as stored on the post (list, dict, string or JSON text).
+
+    Returns:
+        str: Every string found in the tags joined by spaces.
+    """
+    return " ".join(extract_tags(tags))
+
+
+def content_text(content):
+    """
+    Extract the text of HTML post content, so tag names, attributes and class
+    names are not searchable.
+
+    Args:
+        content (str): The HTML content.
+
+    Returns:
+        str: The text with entities decoded, words of adjacent elements kept
+        apart.
+    """
+    return unescape(strip_tags((content or "").replace("<", " <")))
+
+
+def _write_rows(cursor, rows):
+    vendor = connection.vendor
+
+    for post_id, title, excerpt, content, tags in rows:
+        content = content_text(content)
+        if vendor == "sqlite":
+            cursor.execute(
+                f"DELETE FROM {SQLITE_INDEX_TABLE} WHERE rowid = %s", [post_id]
+            )
+            cursor.execute(
+                f"INSERT INTO {SQLITE_INDEX_TABLE} (rowid, title, excerpt, content, tags) "
+                "VALUES (%s, %s, %s, %s, %s)",
+                [post_id, title, excerpt, content, tags_text(tags)],
+            )
+        elif vendor == "postgresql":
+            cursor.execute(
+                f"INSERT INTO {POSTGRES_INDEX_TABLE} (post_id, document) VALUES (%s, "
+                "setweight(to_tsvector('english', %s), 'A') || "
+                "setweight(to_tsvector('english', %s), 'B') || "
+                "setweight(to_tsvector('english', %s), 'B') || "
+                "setweight(to_tsvector('english', %s), 'C')) "
+                "ON CONFLICT (post_id) DO UPDATE SET document = EXCLUDED.document",
+                [post_id, title, tags_text(tags), excerpt, content],
+            )
+
+
+def index_post(post):
+    """
+    Add or refresh a single post in the full-text index.
+
+    Args:
+        post (Post): The saved post.
+    """
+    if connection.vendor not in ["sqlite", "postgresql"]:
+        return
+
+    with connection.cursor() as cursor:
+        _write_rows(
+            cursor,
+            [(post.pk, post.title, post.excerpt, post.content, post.tags)],
+        )
+
+
+def unindex_posts(post_ids):
+    """
+    Remove posts from the full-text index.
+
+    Args:
+        post_ids (list): The IDs of the deleted posts.
+    """
+    post_ids = list(post_ids)
+    if not post_ids:
+        return
+
+    placeholders = ", ".join(["%s"] * len(post_ids))
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute(
+                f"DELETE FROM {SQLITE_INDEX_TABLE} WHERE rowid IN ({placeholders})",
+                post_ids,
+            )
+        elif connection.vendor == "postgresql":
+            cursor.execute(
+                f"DELETE FROM {POSTGRES_INDEX_TABLE} WHERE post_id IN ({placeholders})",
+                post_ids,
+            )
+
+
+def rebuild_index():
+    """
+    Rebuild the full-text index from every row of the posts table.
+
+    Returns:
+        int: The number of posts indexed.
+    """
+    if connection.vendor not in ["sqlite", "postgresql"]:
+        return 0
+
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute(f"DELETE FROM {SQLITE_INDEX_TABLE}")
+        else:
+            cursor.execute(f"DELETE FROM {POSTGRES_INDEX_TABLE}")
+
+        cursor.execute("SELECT id, title, excerpt, content, tags FROM api_post")
+        rows = cursor.fetchall()
+        _write_rows(cursor, rows)
+
+    return len(rows)
+
+
+def search_query(queryset, keyword):
+    """
+    Restrict a post queryset to the posts matching a keyword.
+
+    The keyword is split into words and every word must match a title, excerpt,
+    content or tag, with prefix matching on each word. Matching posts are
+    annotated with a `rank` where lower values are better (BM25 on SQLite,
+    negated ts_rank_cd on PostgreSQL).
+
+    The index table is joined to the posts, so the full-text query runs once
+    and the rank is read from the matching index row instead of running the
+    query again for every post.
+
+    Args:
+        queryset (QuerySet): The post queryset to search in.
+        keyword (str): The user supplied search keyword.
+
+    Returns:
+        QuerySet: The filtered queryset annotated with `rank`.
+    """
+    words = re.findall(r"\w+", keyword)
+    if not words:
+        return queryset.annotate(rank=Value(0.0, output_field=FloatField()))
+
+    if connection.vendor == "sqlite":
+        match = " ".join(f'"{word}"*' for word in words)
+        table = SQLITE_INDEX_TABLE
+        where = [
+            f'"{table}"."rowid" = "api_post"."id"',
+            f'"{table}" MATCH %s',
+        ]
+        rank = RawSQL(
+            f'bm25("{table}", 10.0, 5.0, 1.0, 5.0)', [], output_field=FloatField()
+        )
+    elif connection.vendor == "postgresql":
+        match = " & ".join(f"{word}:*" for word in words)
+        table = POSTGRES_INDEX_TABLE
+        where = [
+            f'"{table}"."post_id" = "api_post"."id"',
+            f'"{table}"."document" @@ to_tsquery(\'english\', %s)',
+        ]
+        rank = RawSQL(
+            f'-ts_rank_cd("{table}"."document", to_tsquery(\'english\', %s))',
+            [match],
+            output_field=FloatField(),
+        )
+    else:
+        keyword_queries = [
+            Q(title__icontains=word) | Q(excerpt__icontains=word) for word in words
+        ]
+        for keyword_query in keyword_queries:
+            queryset = queryset.filter(keyword_query)
+        return queryset.annotate(rank=Value(0.0, output_field=FloatField()))
+
+    return queryset.extra(tables=[table], where=where, params=[match]).annotate(
+        rank=rank
+    )
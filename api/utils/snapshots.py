@@ -0,0 +1,306 @@
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Case, IntegerField, Value, When
+from django.utils import timezone
+from django.utils.text import slugify
+from rest_framework.renderers import JSONRenderer
+
+from api.models.post import Post
+from api.serializers.post import AllPostsSerializer, PostSerializer
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always written
+    brotli = None
+
+MANIFEST = "manifest.json"
+
+
+def export_snapshots(full=False, post_ids=None, categories=()):
+    """
+    Render the public post listings and posts to pre-compressed JSON files.
+
+    Every listing page of every category (and of all categories together) and
+    every public post is written below SNAPSHOT_ROOT next to a .gz and, when
+    brotli is installed, a .br copy, so a web server or CDN can serve them
+    without Django. A manifest records the hash of every file and the
+    last_updated of every post, so later runs only render posts that changed
+    and only write files whose content changed, and remove files that are
+    no longer public.
+
+    After a write only the written posts and the listings of their
+    categories need rendering, the rest of the previous export is kept.
+
+    Args:
+        full (bool): Render and rewrite every file regardless of the manifest.
+        post_ids (list): Only render these posts, and only the listings of
+            `categories` and of all categories. None renders everything.
+        categories (list): The categories of the written posts, before and
+            after the write.
+
+    Returns:
+        dict: The number of files written, unchanged and removed.
+    """
+    root = Path(settings.SNAPSHOT_ROOT)
+    manifest = {} if full else load_manifest(root)
+    files = manifest.get("files", {})
+    posts = manifest.get("posts", {})
+    # Without a previous export everything is rendered
+    partial = post_ids is not None and bool(manifest)
+
+    stats = {"written": 0, "unchanged": 0, "removed": 0}
+    current_files = dict(files) if partial else {}
+    current_posts = dict(posts) if partial else {}
+
+    def write(name, payload):
+        content = JSONRenderer().render(payload)
+        digest = hashlib.sha256(content).hexdigest()
+        current_files[name] = {"sha256": digest, "size": len(content)}
+
+        if not full and files.get(name, {}).get("sha256") == digest:
+            stats["unchanged"] += 1
+            return
+        write_file(root / name, content)
+        stats["written"] += 1
+
+    public = Post.objects.public()
+    rendered = public
+    listings = listing_names(public)
+    if partial:
+        rendered = public.filter(pk__in=post_ids)
+        for post_id in post_ids:
+            current_posts.pop(str(post_id), None)
+            current_files.pop(f"post/{post_id}.json", None)
+
+        # The pages of the listings the posts were or are in are rendered
+        # again, those of listings left empty are removed
+        names = {slugify(category) for category in categories}
+        if names:
+            names.add("all")
+        for name in list(current_files):
+            if name.startswith("posts/") and name.split("/")[1] in names:
+                del current_files[name]
+        listings = {name: listed for name, listed in listings.items() if name in names}
+
+    # Posts are only rendered when they changed since the last export
+    for post_id, last_updated in rendered.values_list("id", "last_updated"):
+        name = f"post/{post_id}.json"
+        current_posts[str(post_id)] = last_updated.isoformat()
+
+        if (
+            not full
+            and not partial
+            and posts.get(str(post_id)) == current_posts[str(post_id)]
+            and name in files
+        ):
+            current_files[name] = files[name]
+            stats["unchanged"] += 1
+            continue
+        write(name, PostSerializer(Post.objects.get(pk=post_id)).data)
+
+    for name, categories in listings.items():
+        listing = public if name == "all" else public.filter(category__in=categories)
+        for page, payload in listing_pages(listing, name):
+            write(f"posts/{name}/page-{page}.json", payload)
+
+    for name in set(files) - set(current_files):
+        remove_file(root / name)
+        stats["removed"] += 1
+
+    write_file(
+        root / MANIFEST,
+        json.dumps(
+            {
+                "generated_at": timezone.now().isoformat(),
+                "files": current_files,
+                "posts": current_posts,
+            },
+            indent=2,
+        ).encode(),
+        compress=False,
+    )
+    return stats
+
+
+def listing_names(posts):
+    """
+    Map the directory names of the listings to the categories they hold.
+
+    Categories are free text, so they are slugified to keep every file below
+    SNAPSHOT_ROOT. Categories with the same slug share a listing, and those
+    without one, or clashing with "all", get none.
+
+    Args:
+        posts (QuerySet): The public posts.
+
+    Returns:
+        dict: The categories keyed by directory name, "all" first.
+    """
+    names = {"all": []}
+    for category in posts.order_by().values_list("category", flat=True).distinct():
+        name = slugify(category)
+        if name and name != "all":
+            names.setdefault(name, []).append(category)
+    return names
+
+
+def listing_pages(posts, category):
+    """
+    Render the pages of a post listing in the search_posts response format.
+
+    Args:
+        posts (QuerySet): The public posts of the listing.
+        category (str): The category of the listing, "all" for every category.
+
+    Yields:
+        tuple: The page number and the page payload.
+    """
+    if category == "events":
+        posts = posts.annotate(
+            past_due=Case(
+                When(event_date__lt=timezone.now(), then=Value(1)),
+                default=Value(0),
+                output_field=IntegerField(),
+            )
+        ).order_by("past_due", "-event_date", "-id")
+    else:
+        posts = posts.order_by("-published", "-id")
+
+    posts = list(posts.select_related("created_by").defer("content", "files"))
+    for post in posts:
+        if post.created_by:
+            post.author = f"{post.created_by.first_name} {post.created_by.last_name}"
+
+    size = settings.SNAPSHOT_PAGE_SIZE
+    pages = max(1, -(-len(posts) // size))
+    for page in range(1, pages + 1):
+        yield page, {
+            "count": len(posts),
+            "next": f"page-{page + 1}.json" if page < pages else None,
+            "previous": f"page-{page - 1}.json" if page > 1 else None,
+            "results": AllPostsSerializer(
+                posts[(page - 1) * size : page * size], many=True
+            ).data,
+        }
+
+
+def load_manifest(root):
+    try:
+        with open(root / MANIFEST) as manifest:
+            return json.load(manifest)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_file(path, content, compress=True):
+    """
+    Atomically write a file and its compressed copies.
+
+    Args:
+        path (Path): The destination of the uncompressed file.
+        content (bytes): The file content.
+        compress (bool): Also write the .gz and .br copies.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    versions = {path: content}
+    if compress:
+        versions[path.with_name(path.name + ".gz")] = gzip.compress(
+            content, compresslevel=9, mtime=0
+        )
+        if brotli is not None:
+            versions[path.with_name(path.name + ".br")] = brotli.compress(content)
+
+    for destination, data in versions.items():
+        handle, temporary = tempfile.mkstemp(dir=path.parent)
+        with os.fdopen(handle, "wb") as file:
+            file.write(data)
+        os.chmod(temporary, 0o644)
+        os.replace(temporary, destination)
+
+
+def remove_file(path):
+    for name in [path.name, path.name + ".gz", path.name + ".br"]:
+        try:
+            os.remove(path.with_name(name))
+        except FileNotFoundError:
+            pass
+
+
+class SnapshotExporter:
+    """
+    Exports the snapshots of written posts in the background.
+
+    Requests only record the posts and categories they wrote once their
+    transaction commits. A single worker thread per process exports every
+    pending post at once, so no request waits for the listings to render.
+    """
+
+    def __init__(self):
+        self._posts = set()
+        self._categories = set()
+        self._lock = threading.Lock()
+        self._running = False
+
+    def schedule(self, post_ids, categories=()):
+        """
+        Export the snapshots of posts once the current transaction commits,
+        when SNAPSHOT_ON_SAVE is on, in the background unless SNAPSHOT_ASYNC
+        is off.
+
+        Args:
+            post_ids (list): The IDs of the written posts.
+            categories (list): The categories of the posts, before and after
+                the write, whose listings changed.
+        """
+        post_ids = list(post_ids)
+        categories = list(categories)
+        if not settings.SNAPSHOT_ON_SAVE or not post_ids:
+            return
+
+        def start():
+            if not settings.SNAPSHOT_ASYNC:
+                export_snapshots(post_ids=post_ids, categories=categories)
+                return
+
+            with self._lock:
+                self._posts.update(post_ids)
+                self._categories.update(categories)
+                if self._running:
+                    return
+                self._running = True
+            threading.Thread(target=self.run, daemon=True).start()
+
+        transaction.on_commit(start)
+
+    def run(self):
+        try:
+            while True:
+                with self._lock:
+                    posts, self._posts = self._posts, set()
+                    categories, self._categories = self._categories, set()
+                    if not posts:
+                        self._running = False
+                        return
+                try:
+                    export_snapshots(post_ids=posts, categories=categories)
+                except Exception:
+                    # Retry with the next batch of writes
+                    with self._lock:
+                        self._posts.update(posts)
+                        self._categories.update(categories)
+                        self._running = False
+                    raise
+        finally:
+            connection.close()
+
+
+snapshot_exporter = SnapshotExporter()
@@ -0,0 +1,77 @@
+import json
+
+from django.utils.text import slugify
+
+# The size of the PostTag slug and name columns
+TAG_LENGTH = 150
+
+
+def extract_tags(tags):
+    """
+    Collect the tag names stored in the JSON tags of a post.
+
+    Args:
+        tags: The tags value as stored on the post (list, dict, string or JSON text).
+
+    Returns:
+        list: Every string found in the tags, in order.
+    """
+    if isinstance(tags, str):
+        try:
+            tags = json.loads(tags)
+        except ValueError:
+            return [tags]
+
+    if isinstance(tags, dict):
+        tags = list(tags.values())
+    if isinstance(tags, (list, tuple)):
+        return [name for value in tags for name in extract_tags(value)]
+    if isinstance(tags, str):
+        return [tags]
+    return []
+
+
+def tag_slugs(tags):
+    """
+    Map the slug of every tag of a post to its display name.
+
+    Slugs and names are cut to the size of their columns, tags whose slugs
+    only differ past it share the first one's name.
+
+    Args:
+        tags: The tags value as stored on the post.
+
+    Returns:
+        dict: The tag names keyed by slug, first spelling wins.
+    """
+    slugs = {}
+    for name in extract_tags(tags):
+        slug = slugify(name)[:TAG_LENGTH].strip("-_")
+        if slug and slug not in slugs:
+            slugs[slug] = name.strip()[:TAG_LENGTH]
+    return slugs
+
+
+def sync_post_tags(post):
+    """
+    Bring the tag index rows of a post in line with its JSON tags.
+
+    Args:
+        post (Post): The saved post.
+    """
+    from api.models.tag import PostTag
+
+    slugs = tag_slugs(post.tags)
+    existing = set(PostTag.objects.filter(post=post).values_list("slug", flat=True))
+
+    removed = existing - set(slugs)
+    if removed:
+        PostTag.objects.filter(post=post, slug__in=removed).delete()
+
+    PostTag.objects.bulk_create(
+        [
+            PostTag(post=post, slug=slug, name=name)
+            for slug, name in slugs.items()
+            if slug not in existing
+        ]
+    )
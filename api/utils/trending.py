@@ -0,0 +1,75 @@
+import math
+import time
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from api.models.post import Post
+from api.models.viewbucket import PostViewBucket
+from api.utils.cache import bump_versions, get_cache
+
+# Cache key of the precomputed ranking and namespace of the responses built from it
+TRENDING_KEY = "trending:scores"
+TRENDING_NAMESPACE = "trending"
+
+
+def compute_trending():
+    """
+    Rank the public posts by their time-decayed views.
+
+    Every hourly bucket within the window counts its views weighted by
+    0.5 ** (age / half-life), so recent views outweigh older ones.
+
+    Returns:
+        list: The top (post ID, score) pairs, highest score first.
+    """
+    now = timezone.now()
+    since = now - timedelta(hours=settings.TRENDING_WINDOW_HOURS)
+    decay = math.log(2) / settings.TRENDING_HALF_LIFE_HOURS
+
+    scores = defaultdict(float)
+    buckets = PostViewBucket.objects.filter(
+        hour__gte=since, post__in=Post.objects.public()
+    ).values_list("post_id", "hour", "views")
+    for post_id, hour, views in buckets.iterator():
+        age = (now - hour).total_seconds() / 3600
+        scores[post_id] += views * math.exp(-decay * age)
+
+    ranking = sorted(scores.items(), key=lambda item: (-item[1], -item[0]))
+    return ranking[: settings.TRENDING_POSTS_COUNT]
+
+
+def refresh_trending():
+    """
+    Recompute and cache the trending ranking, and prune expired view buckets.
+
+    Returns:
+        list: The top (post ID, score) pairs, highest score first.
+    """
+    ranking = compute_trending()
+    get_cache().set(TRENDING_KEY, {"computed_at": time.time(), "posts": ranking}, None)
+    bump_versions(TRENDING_NAMESPACE)
+
+    PostViewBucket.objects.filter(
+        hour__lt=timezone.now() - timedelta(hours=settings.TRENDING_WINDOW_HOURS)
+    ).delete()
+    return ranking
+
+
+def trending_ranking():
+    """
+    Return the cached trending ranking, recomputing it when it is missing or
+    older than the refresh interval.
+
+    Returns:
+        list: The top (post ID, score) pairs, highest score first.
+    """
+    ranking = get_cache().get(TRENDING_KEY)
+    if (
+        ranking is None
+        or time.time() - ranking["computed_at"] >= settings.TRENDING_REFRESH_INTERVAL
+    ):
+        return refresh_trending()
+    return ranking["posts"]
@@ -7,7 +7,9 @@ from rest_framework import status
 from rest_framework.decorators import api_view
 from api.models.administrator import Administrator
 from api.serializers.administrator import AdministratorSerializer
+from api.utils.conditional import conditional_on_last_updated, last_updated_of
 from api.utils.email import send_email
+from api.utils.projection import only_serialized_fields
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -32,6 +34,9 @@ def admin_access_required(view_func):
 
 @api_view(["GET"])
 @admin_access_required
+@conditional_on_last_updated(
+    last_updated_of(Administrator, "created_by__last_updated"), "administrator_id"
+)
 def get_administrator(request, administrator_id):
     """
     Retrieve details of an administrator by their administrator ID.
@@ -66,7 +71,9 @@ def get_administrators(request):
     Returns:
     - Serialized data for all administrators.
     """
-    administrators = Administrator.objects.all()
+    administrators = only_serialized_fields(
+        Administrator.objects.all(), AdministratorSerializer
+    )
 
     for administrator in administrators:
         author = Administrator.objects.get(pk=administrator.created_by_id)
@@ -2,8 +2,10 @@ from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework import status
 from api.models.comment import Comment
-from api.models.member import Member
 from api.serializers.comment import CommentSerializer
+from api.utils.authors import author_snapshot
+from api.utils.events import events
+from api.utils.projection import only_serialized_fields
 
 
 @api_view(["POST"])
@@ -30,7 +32,8 @@ def create_comment(request):
 
     serializer = CommentSerializer(data=request.data)
     if serializer.is_valid():
-        serializer.save()
+        serializer.save(**author_snapshot(request.user, Comment))
+        events.publish("comment", serializer.data)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -124,12 +127,9 @@ def socialpost_comments(request, socialpost_id):
     Returns:
     - Serialized data for all comments for a single socialpost.
     """
-    comments = Comment.objects.filter(socialpost=socialpost_id).order_by("-created_at")
-
-    for comment in comments:
-        member = Member.objects.get(pk=comment.created_by_id)
-        comment.author = f"{member.first_name} {member.last_name}"
-        comment.company = member.company
+    comments = only_serialized_fields(
+        Comment.objects.filter(socialpost=socialpost_id), CommentSerializer
+    ).order_by("-created_at")
 
     serializer = CommentSerializer(comments, many=True)
     return Response(serializer.data)
@@ -8,6 +8,7 @@ from api.models.post import Post
 from api.models.administrator import Administrator
 from api.models.invoice import Invoice
 from api.models.donation import Donation
+from api.utils.cache import cache_stats
 
 
 def admin_access_required(view_func):
@@ -89,6 +90,18 @@ def member_stats(request):
     return Response(response)
 
 
+@api_view(["GET"])
+@admin_access_required
+def post_cache_stats(request):
+    """
+    Returns the hit and miss counters of the public post caches.
+
+    Returns:
+        Response: A dictionary containing the number of cache hits and misses.
+    """
+    return Response(cache_stats())
+
+
 def total_invoice_payments(invoices):
     total_amount = 0
 
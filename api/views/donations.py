@@ -7,6 +7,7 @@ from rest_framework import status
 from rest_framework.pagination import PageNumberPagination
 from api.models.donation import Donation
 from api.serializers.donation import DonationSerializer
+from api.utils.projection import only_serialized_fields
 
 
 def admin_access_required(view_func):
@@ -93,7 +94,7 @@ def update_donation(request, donation_id):
             {"error": "Donation not found."}, status=status.HTTP_404_NOT_FOUND
         )
 
-    serializer = DonationSerializer(donation, data=request.data)
+    serializer = DonationSerializer(donation, data=request.data, partial=True)
     if serializer.is_valid():
         serializer.save()
         return Response(serializer.data)
@@ -154,6 +155,8 @@ def search_donations(request):
     else:
         data = Donation.objects.filter(**query).order_by("-created_at")
 
+    data = only_serialized_fields(data, DonationSerializer)
+
     paginator = PageNumberPagination()
     paginator.page_size = request.data["limit"]
     paginated_posts = paginator.paginate_queryset(data, request)
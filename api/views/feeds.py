@@ -0,0 +1,204 @@
+import hashlib
+
+from django.conf import settings
+from django.db.models import Count, Max
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from django.views.decorators.http import require_GET
+from api.models.post import Post
+from api.utils.cache import get_cached, set_cached
+from api.utils.cache import make_key, post_namespace, post_timeout
+from api.utils.conditional import set_validators
+from api.utils.feeds import SITEMAP_LIMIT, atom_chunks, cache_stream
+from api.utils.feeds import rss_chunks, sitemap_chunks
+from api.utils.ical import build_calendar
+
+
+@require_GET
+def events_calendar(request):
+    """
+    Serve the public events as an iCalendar feed.
+
+    The calendar is cached until an event post is written and carries an ETag,
+    so polling calendar clients get a 304 response without touching the
+    database.
+
+    Parameters:
+    - request: The HTTP request object.
+
+    Returns:
+    - The text/calendar feed of the public events, or a 304 response.
+
+    HTTP Methods: GET
+    """
+    domain = request.get_host()
+    key = make_key("events-ics", post_namespace("events"), {"domain": domain})
+
+    cached = get_cached(key)
+    if cached is None:
+        events = (
+            Post.objects.public()
+            .filter(category="events")
+            .only(
+                "id",
+                "title",
+                "excerpt",
+                "event_date",
+                "venue",
+                "venue_link",
+                "last_updated",
+            )
+            .order_by("event_date", "id")
+        )
+        body = build_calendar(events.iterator(), domain).encode()
+        cached = (quote_etag(hashlib.sha1(body).hexdigest()), body)
+        set_cached(key, cached, post_timeout("events"))
+
+    etag, body = cached
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(body, content_type="text/calendar; charset=utf-8")
+    response["ETag"] = etag
+    return response
+
+
+def feed_validators(key, posts, category):
+    """
+    Return the cached ETag and Last-Modified time of a feed.
+
+    Parameters:
+    - key: The cache key of the validators.
+    - posts: The posts the feed is built from.
+    - category: The category of the feed, if any.
+
+    Returns:
+    - The quoted ETag and the last update of any post, if any.
+    """
+    validators = get_cached(key)
+    if validators is None:
+        state = posts.aggregate(
+            count=Count("id"), updated=Max("last_updated"), published=Max("published")
+        )
+        digest = hashlib.sha1(
+            f"{key}:{state['count']}:{state['updated']}:{state['published']}".encode()
+        ).hexdigest()
+        validators = (quote_etag(digest), state["updated"])
+        set_cached(key, validators, post_timeout(category))
+    return validators
+
+
+def serve_feed(request, prefix, category, content_type, render):
+    """
+    Serve a cached XML document built from public posts with conditional GET.
+
+    On a cache miss the document is streamed while it is rendered and cached
+    once complete.
+
+    Parameters:
+    - request: The HTTP request object.
+    - prefix: The name of the document, used in its cache keys.
+    - category: The category the document is restricted to, if any.
+    - content_type: The content type of the document.
+    - render: A function taking the posts and the last update time and
+      returning the parts of the document.
+
+    Returns:
+    - The document, or a 304 response when the client copy is current.
+    """
+    posts = Post.objects.public()
+    if category:
+        posts = posts.filter(category=category)
+
+    namespace = post_namespace(category)
+    params = {"uri": request.build_absolute_uri()}
+
+    etag, updated = feed_validators(
+        make_key(f"{prefix}-validators", namespace, params), posts, category
+    )
+    last_modified = int(updated.timestamp()) if updated else None
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        key = make_key(prefix, namespace, params)
+        body = get_cached(key)
+        if body is not None:
+            response = HttpResponse(body, content_type=content_type)
+        else:
+            posts = posts.select_related("created_by").only(
+                "id",
+                "title",
+                "excerpt",
+                "category",
+                "published",
+                "author",
+                "last_updated",
+                "created_by__first_name",
+                "created_by__last_name",
+            )
+            response = StreamingHttpResponse(
+                cache_stream(
+                    render(posts, updated or timezone.now()),
+                    key,
+                    post_timeout(category),
+                ),
+                content_type=content_type,
+            )
+
+    set_validators(response, etag, last_modified)
+    return response
+
+
+@require_GET
+def posts_feed(request, category=None, feed_type="rss"):
+    """
+    Serve the latest public posts as an RSS or Atom feed.
+
+    Parameters:
+    - request: The HTTP request object.
+    - category: (Optional) The category to restrict the feed to.
+    - feed_type: "rss" or "atom".
+
+    Returns:
+    - The feed of the latest public posts, or a 304 response.
+
+    HTTP Methods: GET
+    """
+    feed_url = request.build_absolute_uri()
+
+    def render(posts, updated):
+        posts = posts.order_by("-published", "-id")[: settings.FEED_ITEMS]
+        if feed_type == "atom":
+            return atom_chunks(posts.iterator(), category, feed_url, updated)
+        return rss_chunks(posts.iterator(), category, feed_url)
+
+    content_type = (
+        "application/atom+xml; charset=utf-8"
+        if feed_type == "atom"
+        else "application/rss+xml; charset=utf-8"
+    )
+    return serve_feed(request, f"feed-{feed_type}", category, content_type, render)
+
+
+@require_GET
+def sitemap(request):
+    """
+    Serve the XML sitemap of the public posts.
+
+    Parameters:
+    - request: The HTTP request object.
+
+    Returns:
+    - The sitemap, or a 304 response.
+
+    HTTP Methods: GET
+    """
+
+    def render(posts, updated):
+        posts = posts.order_by("-published", "-id")[:SITEMAP_LIMIT]
+        return sitemap_chunks(posts.iterator(chunk_size=1000))
+
+    return serve_feed(
+        request, "sitemap", None, "application/xml; charset=utf-8", render
+    )
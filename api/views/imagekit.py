@@ -7,8 +7,10 @@ from rest_framework.decorators import api_view
 from imagekitio import ImageKit
 from imagekitio.models.UploadFileRequestOptions import UploadFileRequestOptions
 
-from api.models.post import Post
+from api.models.file import PostFile
 from api.serializers.imagekit import ImagekitSerializer
+from api.utils.cache import bump_post_caches
+from api.utils.files import detach_files
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -66,30 +68,36 @@ def upload_file(request):
 @api_view(['DELETE'])
 def delete_file(request):
     """
-    Delete a file by name.
+    Delete a file and detach it from the post owning it.
 
     Args:
-        request (Request): The Django request object.
+        request (Request): The Django request object holding the file_id and,
+            optionally, the post_id of the file.
 
     Returns:
-        Response: The Django response object.
+        Response: The files of the post owning the file.
 
     Raises:
         Exception: If an error occurs during the deletion process.
     """
     try:
-        response = imagekit.delete_file(file_id=request.data.get("file_id"))
+        file_id = request.data.get("file_id")
+        post_files = PostFile.objects.filter(file_id=file_id)
+        if request.data.get("post_id"):
+            post_files = post_files.filter(post_id=request.data.get("post_id"))
+        post_file = (
+            post_files.select_related("post").only("post", "post__category").first()
+        )
+
+        response = imagekit.delete_file(file_id=file_id)
 
         if response.response_metadata.http_status_code == 204:
-            post = Post.objects.get(pk=request.data.get("post_id"))
-            files = post.files["data"]
-            count = 0
-            for file in files:
-                if file["file_id"] == request.data.get("file_id"):
-                    del files[count]
-                count += 1
-            post.files["data"] = files
-            return Response(post.files)
+            if post_file is None:
+                return Response({"data": []})
+
+            files = detach_files(post_file.post_id, [file_id])
+            bump_post_caches(post_file.post.category)
+            return Response(files)
         else:
             return Response({'error': 'Failed to delete image'})
     except Exception as e:
@@ -1,7 +1,7 @@
 import datetime
 from functools import wraps, reduce
 
-from django.db.models import Q
+from django.db.models import Count, Max, Q, Sum
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.decorators import api_view
@@ -9,6 +9,8 @@ from rest_framework.pagination import PageNumberPagination
 from api.models.invoice import Invoice
 from api.models.payment import Payment
 from api.serializers.invoice import InvoiceSerializer
+from api.utils.conditional import conditional_on_last_updated
+from api.utils.projection import only_serialized_fields
 
 
 def admin_access_required(view_func):
@@ -29,7 +31,35 @@ def admin_access_required(view_func):
     return _wrapped_view
 
 
+def invoice_validators(invoice_id):
+    """
+    Return the values the invoice details response depends on.
+
+    The payment details are derived from the payments of the invoice, so their
+    count, total and latest update are part of the validators.
+
+    Parameters:
+    - invoice_id: The ID of the invoice.
+
+    Returns:
+    - A tuple of validator values, or None if the invoice does not exist.
+    """
+    invoice = (
+        Invoice.objects.filter(pk=invoice_id)
+        .values_list("last_updated", "invoice_number")
+        .first()
+    )
+    if invoice is None:
+        return None
+
+    payments = Payment.objects.filter(invoice_number=invoice[1]).aggregate(
+        count=Count("id"), total=Sum("amount"), last_updated=Max("last_updated")
+    )
+    return invoice + (payments["count"], payments["total"], payments["last_updated"])
+
+
 @api_view(["GET"])
+@conditional_on_last_updated(invoice_validators, "invoice_id")
 def get_invoice(request, invoice_id):
     """
     Retrieve details of a specific invoice by its ID.
@@ -102,7 +132,7 @@ def update_invoice(request, invoice_id):
             {"error": "Invoice not found."}, status=status.HTTP_404_NOT_FOUND
         )
 
-    serializer = InvoiceSerializer(invoice, data=request.data)
+    serializer = InvoiceSerializer(invoice, data=request.data, partial=True)
     if serializer.is_valid():
         serializer.save()
         return Response(serializer.data)
@@ -243,6 +273,8 @@ def search_invoices(request):
     else:
         invoices = Invoice.objects.filter(**query).order_by("-created_at")
 
+    invoices = only_serialized_fields(invoices, InvoiceSerializer)
+
     for invoice in invoices:
         invoice = payment_details(invoice)
 
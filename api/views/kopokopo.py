@@ -8,6 +8,7 @@ from rest_framework.response import Response
 from api.models.kopokopo import Kopokopo
 from api.serializers.kopokopo import KopokopoSerializer
 from api.serializers.payment import PaymentSerializer
+from api.utils.projection import only_serialized_fields
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -191,7 +192,9 @@ def get_all_kopokopo_payments(request):
     Returns:
     - Serialized data for all kopokopo payments.
     """
-    kopokopo_payments = Kopokopo.objects.all()
+    kopokopo_payments = only_serialized_fields(
+        Kopokopo.objects.all(), KopokopoSerializer
+    )
     serializer = KopokopoSerializer(kopokopo_payments, many=True)
     return Response(serializer.data)
 
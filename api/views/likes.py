@@ -0,0 +1,143 @@
+from functools import wraps
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from rest_framework import status
+from api.models.like import Like
+from api.models.socialpost import SocialPost
+from api.utils.cache import bump_member_caches
+from api.utils.likes import liked_by
+
+
+def member_access_required(view_func):
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        if getattr(request.user, "user_type", None) == "member":
+            return view_func(request, *args, **kwargs)
+        else:
+            return Response({"message": "Member is not authorized"}, status=403)
+
+    return _wrapped_view
+
+
+def like_count(socialpost_id, changed):
+    """
+    Read the likes of a socialpost after a like or unlike, and invalidate
+    the cached timeline of its author when the count changed.
+
+    Parameters:
+    - socialpost_id: The ID of the socialpost.
+    - changed: Whether the like or unlike changed the count.
+
+    Returns:
+    - The number of likes, or None if the socialpost does not exist.
+    """
+    socialpost = (
+        SocialPost.objects.filter(pk=socialpost_id)
+        .values("likes", "created_by")
+        .first()
+    )
+    if socialpost is None:
+        return None
+
+    if changed:
+        bump_member_caches(socialpost["created_by"])
+    return socialpost["likes"]
+
+
+@api_view(["POST"])
+@member_access_required
+def like_socialpost(request, socialpost_id):
+    """
+    Like a socialpost as the authenticated member.
+
+    The like row and the counter are written in one transaction. The unique
+    (member, socialpost) index turns a repeated or concurrent like into a
+    rollback of the increment, so liking is idempotent and no count is lost.
+
+    Parameters:
+    - request: The HTTP request object.
+    - socialpost_id: The ID of the socialpost to like.
+
+    Returns:
+    - The like state and the number of likes of the socialpost.
+    - If the socialpost does not exist, returns an error response.
+
+    HTTP Methods: POST
+    """
+    try:
+        with transaction.atomic():
+            liked = SocialPost.objects.filter(pk=socialpost_id).update(
+                likes=F("likes") + 1, last_updated=timezone.now()
+            )
+            if not liked:
+                return Response(
+                    {"error": "Post not found."}, status=status.HTTP_404_NOT_FOUND
+                )
+
+            Like.objects.create(member=request.user, socialpost_id=socialpost_id)
+    except IntegrityError:
+        # Already liked, the increment was rolled back
+        liked = False
+
+    return Response({"liked": True, "likes": like_count(socialpost_id, liked)})
+
+
+@api_view(["POST"])
+@member_access_required
+def unlike_socialpost(request, socialpost_id):
+    """
+    Remove the like of the authenticated member from a socialpost.
+
+    Unliking a socialpost that is not liked changes nothing.
+
+    Parameters:
+    - request: The HTTP request object.
+    - socialpost_id: The ID of the socialpost to unlike.
+
+    Returns:
+    - The like state and the number of likes of the socialpost.
+    - If the socialpost does not exist, returns an error response.
+
+    HTTP Methods: POST
+    """
+    with transaction.atomic():
+        deleted, _ = Like.objects.filter(
+            member=request.user, socialpost_id=socialpost_id
+        ).delete()
+        if deleted:
+            SocialPost.objects.filter(pk=socialpost_id, likes__gt=0).update(
+                likes=F("likes") - 1, last_updated=timezone.now()
+            )
+
+    likes = like_count(socialpost_id, deleted)
+    if likes is None:
+        return Response({"error": "Post not found."}, status=status.HTTP_404_NOT_FOUND)
+
+    return Response({"liked": False, "likes": likes})
+
+
+@api_view(["GET"])
+@member_access_required
+def liked_socialposts(request):
+    """
+    Find which socialposts of a list the authenticated member has liked.
+
+    Parameters:
+    - ids (query): The comma separated IDs of the socialposts, e.g. the
+      socialposts of a feed page, up to SOCIALPOSTS_MAX_PAGE_SIZE.
+
+    Returns:
+    - The IDs of the socialposts the member liked.
+    """
+    try:
+        ids = [int(pk) for pk in request.query_params.get("ids", "").split(",") if pk]
+    except ValueError:
+        return Response({"error": "Invalid ids."}, status=status.HTTP_400_BAD_REQUEST)
+
+    ids = ids[: settings.SOCIALPOSTS_MAX_PAGE_SIZE]
+    return Response({"liked": sorted(liked_by(request.user, ids))})
@@ -9,8 +9,10 @@ from rest_framework import status
 from rest_framework.pagination import PageNumberPagination
 from rest_framework_simplejwt.tokens import RefreshToken
 from api.models.member import Member
-from api.serializers.member import MemberSerializer
+from api.serializers.member import AllMembersSerializer, MemberSerializer
+from api.utils.conditional import conditional_on_last_updated, last_updated_of
 from api.utils.email import send_email
+from api.utils.projection import only_serialized_fields
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -39,6 +41,7 @@ def admin_access_required(view_func):
 
 
 @api_view(["GET"])
+@conditional_on_last_updated(last_updated_of(Member), "member_id")
 def get_member(request, member_id):
     """
     Retrieve details of a member by their member ID.
@@ -79,7 +82,6 @@ def create_member(request):
         password = serializer.validated_data.get("password")
         serializer.validated_data["password"] = make_password(password)
         serializer.validated_data["bookmarks"] = []
-        serializer.validated_data["likes"] = []
 
         member = serializer.save()
 
@@ -270,10 +272,12 @@ def search_members(request):
     else:
         data = Member.objects.filter(**query).order_by("subscription_category")
 
+    data = only_serialized_fields(data, AllMembersSerializer)
+
     paginator = PageNumberPagination()
     paginator.page_size = request.data["limit"]
     paginated_posts = paginator.paginate_queryset(data, request)
-    post_serializer = MemberSerializer(paginated_posts, many=True)
+    post_serializer = AllMembersSerializer(paginated_posts, many=True)
 
     return paginator.get_paginated_response(post_serializer.data)
 
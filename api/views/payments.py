@@ -12,6 +12,7 @@ from api.models.donation import Donation
 from api.serializers.payment import PaymentSerializer
 from api.serializers.invoice import InvoiceSerializer
 from api.utils.email import send_email
+from api.utils.projection import only_serialized_fields
 
 
 def admin_access_required(view_func):
@@ -98,10 +99,10 @@ def update_payment(request, payment_id):
             {"error": "Payment not found."}, status=status.HTTP_404_NOT_FOUND
         )
 
-    serializer = PaymentSerializer(payment, data=request.data)
+    serializer = PaymentSerializer(payment, data=request.data, partial=True)
     if serializer.is_valid():
         serializer.save()
-        if payment.invoice_number:
+        if payment.invoice_number and serializer.changed_fields:
             update_invoice_status(payment.invoice_number)
         return Response(serializer.data)
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -220,6 +221,8 @@ def search_payments(request):
     else:
         data = Payment.objects.filter(**query).order_by("-created_at")
 
+    data = only_serialized_fields(data, PaymentSerializer)
+
     paginator = PageNumberPagination()
     paginator.page_size = request.data["limit"]
     paginated_posts = paginator.paginate_queryset(data, request)
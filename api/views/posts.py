@@ -1,4 +1,3 @@
-from datetime import datetime
 from functools import wraps
 
 from rest_framework.decorators import api_view
@@ -6,10 +5,29 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.pagination import PageNumberPagination
 from api.models.post import Post
-from api.models.administrator import Administrator
+from api.models.tag import PostTag
+from api.models.related import RelatedPost
+from api.models.revision import PostRevision
 from api.serializers.post import PostSerializer
-from api.serializers.post import AllPostsSerializer
-from django.db.models import Case, When, Value
+from api.serializers.post import AllPostsSerializer, BulkPostSerializer
+from api.serializers.revision import PostRevisionSerializer
+from api.utils.cache import ALL_POSTS, bump_post_caches, get_cached, get_version
+from api.utils.cache import set_cached
+from api.utils.cache import make_key, post_namespace, post_timeout
+from api.utils.conditional import conditional_on_last_updated, last_updated_of
+from api.utils.counters import post_views
+from api.utils.files import attach_files, detach_files
+from api.utils.locks import select_for_update
+from api.utils.pagination import KeysetPagination
+from api.utils.projection import only_serialized_fields
+from api.utils.related import RELATED_SOURCE_FIELDS, related_refresher, related_to
+from api.utils.revisions import REVISION_FIELDS, revision_fields
+from api.utils.search import search_query, unindex_posts
+from api.utils.snapshots import snapshot_exporter
+from api.utils.trending import TRENDING_NAMESPACE, trending_ranking
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, Count, Min, When, Value
 from django.db.models import IntegerField
 from django.utils import timezone
 
@@ -31,7 +49,21 @@ def admin_access_required(view_func):
     return _wrapped_view
 
 
+def count_post_view(view_func):
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        # Visitor reads count as views, including not modified responses
+        if getattr(request.user, "user_type", None) != "administrator":
+            post_views.record(kwargs.get("post_id"))
+
+        return view_func(request, *args, **kwargs)
+
+    return _wrapped_view
+
+
 @api_view(["GET"])
+@count_post_view
+@conditional_on_last_updated(last_updated_of(Post, "attendee_count"), "post_id")
 def get_post(request, post_id):
     """
     Retrieve details of a post by their post ID.
@@ -46,10 +78,8 @@ def get_post(request, post_id):
     try:
         post = Post.objects.get(pk=post_id)
 
-        if getattr(request.user, "user_type", None) != "administrator":
-            # Update view count
-            post.views += 1
-            post.save()  # Save the updated view count
+        # Include the views that are buffered but not yet written
+        post.views += post_views.pending(post.pk)
 
         serializer = PostSerializer(post)
         return Response(serializer.data)
@@ -57,6 +87,43 @@ def get_post(request, post_id):
         return Response({"error": "Post not found."}, status=status.HTTP_404_NOT_FOUND)
 
 
+@api_view(["GET"])
+def related_posts(request, post_id):
+    """
+    Retrieve the posts related to a post.
+
+    Parameters:
+    - post_id: The ID of the post.
+
+    Returns:
+    - List of the published related posts, most similar first. Visitors only
+      get public posts.
+    """
+    related_ids = list(
+        RelatedPost.objects.filter(post_id=post_id)
+        .order_by("-score")
+        .values_list("related_id", flat=True)
+    )
+
+    posts = Post.objects.filter(
+        pk__in=related_ids, status="published", published__lt=timezone.now()
+    )
+    if getattr(request.user, "user_type", None) not in ["member", "administrator"]:
+        posts = posts.filter(access="public")
+
+    posts = only_serialized_fields(
+        posts.select_related("created_by"),
+        AllPostsSerializer,
+        "created_by__first_name",
+        "created_by__last_name",
+    )
+    posts = sorted(posts, key=lambda post: related_ids.index(post.pk))
+
+    set_authors(posts)
+    serializer = AllPostsSerializer(posts, many=True)
+    return Response(serializer.data)
+
+
 @api_view(["POST"])
 @admin_access_required
 def create_post(request):
@@ -76,7 +143,10 @@ def create_post(request):
     if serializer.is_valid():
         serializer.validated_data["created_by"] = request.user
 
-        serializer.save()
+        post = serializer.save()
+        bump_post_caches(post.category)
+        related_refresher.schedule([post.pk])
+        snapshot_exporter.schedule([post.pk], [post.category])
         return Response(serializer.data, status=status.HTTP_201_CREATED)
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -102,11 +172,148 @@ def update_post(request, post_id):
     except Post.DoesNotExist:
         return Response({"error": "Post not found."}, status=status.HTTP_404_NOT_FOUND)
 
-    serializer = PostSerializer(post, data=request.data)
-    if serializer.is_valid():
-        serializer.save()
-        return Response(serializer.data)
-    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    serializer = save_post(post, request.data, request.user)
+    if serializer.errors:
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    return Response(serializer.data)
+
+
+def save_post(post, data, author):
+    """
+    Apply a partial update to a post and run the follow-up work of a write.
+
+    The post is locked while it is updated, so data built from it is not
+    overwritten by a concurrent edit. Post.save() records the revision.
+
+    Parameters:
+    - post: The post to update.
+    - data: The changed post fields, or a function building them from the
+      locked post.
+    - author: The administrator making the change.
+
+    Returns:
+    - The validated serializer, holding the errors if the data is invalid.
+    """
+    with transaction.atomic():
+        post = select_for_update(Post.objects.filter(pk=post.pk)).get()
+        category = post.category
+
+        if callable(data):
+            data = data(post)
+        serializer = PostSerializer(post, data=data, partial=True)
+        if not serializer.is_valid():
+            return serializer
+
+        post.revision_author = author
+        post = serializer.save()
+
+    if serializer.changed_fields:
+        bump_post_caches(category, post.category)
+        if set(serializer.changed_fields) & set(RELATED_SOURCE_FIELDS):
+            related_refresher.schedule([post.pk])
+        snapshot_exporter.schedule([post.pk], [category, post.category])
+    return serializer
+
+
+@api_view(["GET"])
+@admin_access_required
+def post_revisions(request, post_id):
+    """
+    Retrieve the revision history of a post.
+
+    Parameters:
+    - post_id: The ID of the post.
+    - page (query): The page number for pagination.
+    - limit (query): (Optional) The maximum number of results per page.
+
+    Returns:
+    - Paginated list of the revisions, newest first, without their content.
+    """
+    revisions = only_serialized_fields(
+        PostRevision.objects.filter(post_id=post_id), PostRevisionSerializer
+    ).order_by("-number")
+
+    paginator = PageNumberPagination()
+    paginator.page_size_query_param = "limit"
+    paginated_revisions = paginator.paginate_queryset(revisions, request)
+
+    serializer = PostRevisionSerializer(paginated_revisions, many=True)
+    return paginator.get_paginated_response(serializer.data)
+
+
+@api_view(["GET"])
+@admin_access_required
+def get_post_revision(request, post_id, number):
+    """
+    Retrieve the title, excerpt and content of a post as saved by a revision.
+
+    Parameters:
+    - post_id: The ID of the post.
+    - number: The revision number, 0 for the post before its first revision.
+
+    Returns:
+    - The revision number and the post fields as saved by it.
+    - If the post or revision does not exist, or the post was changed without
+      recording a revision since, returns an error response.
+    """
+    try:
+        post = Post.objects.only("id", *REVISION_FIELDS).get(pk=post_id)
+    except Post.DoesNotExist:
+        return Response({"error": "Post not found."}, status=status.HTTP_404_NOT_FOUND)
+
+    if number and not PostRevision.objects.filter(post=post, number=number).exists():
+        return Response(
+            {"error": "Revision not found."}, status=status.HTTP_404_NOT_FOUND
+        )
+
+    try:
+        fields = revision_fields(post, number)
+    except ValueError as error:
+        return Response({"error": str(error)}, status=status.HTTP_409_CONFLICT)
+
+    return Response({"number": number, **fields})
+
+
+@api_view(["POST"])
+@admin_access_required
+def restore_post_revision(request, post_id, number):
+    """
+    Restore the title, excerpt and content of a post from a revision.
+
+    The restore is saved as a new revision, so it can be undone as well.
+
+    Parameters:
+    - request: The HTTP request object.
+    - post_id: The ID of the post.
+    - number: The revision number, 0 for the post before its first revision.
+
+    Returns:
+    - The updated post data.
+    - If the post or revision does not exist, or the post was changed without
+      recording a revision since, returns an error response.
+
+    HTTP Methods: POST
+    """
+    try:
+        post = Post.objects.get(pk=post_id)
+    except Post.DoesNotExist:
+        return Response({"error": "Post not found."}, status=status.HTTP_404_NOT_FOUND)
+
+    if number and not PostRevision.objects.filter(post=post, number=number).exists():
+        return Response(
+            {"error": "Revision not found."}, status=status.HTTP_404_NOT_FOUND
+        )
+
+    try:
+        serializer = save_post(
+            post, lambda post: revision_fields(post, number), request.user
+        )
+    except ValueError as error:
+        return Response({"error": str(error)}, status=status.HTTP_409_CONFLICT)
+
+    if serializer.errors:
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    return Response(serializer.data)
 
 
 @api_view(["POST"])
@@ -130,10 +337,163 @@ def delete_post(request, post_id):
     except Post.DoesNotExist:
         return Response({"error": "Post not found."}, status=status.HTTP_404_NOT_FOUND)
 
+    affected = related_to(post_id)
+
     post.delete()
+    bump_post_caches(post.category)
+    related_refresher.schedule(related_ids=affected)
+    snapshot_exporter.schedule([post_id], [post.category])
     return Response(status=status.HTTP_204_NO_CONTENT)
 
 
+@api_view(["POST"])
+@admin_access_required
+def attach_post_files(request, post_id):
+    """
+    Attach uploaded files to a post.
+
+    Parameters:
+    - request: The HTTP request object.
+    - post_id: The ID of the post.
+    - files (body): The uploaded file entries, each holding a file_id. Entries
+      of files already attached replace the stored ones.
+
+    Returns:
+    - The files of the post.
+    - If the post does not exist or no files are given, returns an error response.
+
+    HTTP Methods: POST
+    """
+    files = request.data.get("files")
+    if not isinstance(files, list) or not files:
+        return Response(
+            {"error": "A list of files is required."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    try:
+        post = Post.objects.only("id", "category").get(pk=post_id)
+    except Post.DoesNotExist:
+        return Response({"error": "Post not found."}, status=status.HTTP_404_NOT_FOUND)
+
+    post_files = attach_files(post.pk, files)
+    bump_post_caches(post.category)
+    # Listings do not show files
+    snapshot_exporter.schedule([post.pk])
+    return Response(post_files)
+
+
+@api_view(["POST"])
+@admin_access_required
+def detach_post_files(request, post_id):
+    """
+    Detach files from a post.
+
+    Parameters:
+    - request: The HTTP request object.
+    - post_id: The ID of the post.
+    - file_ids (body): The IDs of the files to detach.
+
+    Returns:
+    - The files of the post.
+    - If the post does not exist or no file IDs are given, returns an error response.
+
+    HTTP Methods: POST
+    """
+    file_ids = request.data.get("file_ids")
+    if not isinstance(file_ids, list) or not file_ids:
+        return Response(
+            {"error": "A list of file IDs is required."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    try:
+        post = Post.objects.only("id", "category").get(pk=post_id)
+    except Post.DoesNotExist:
+        return Response({"error": "Post not found."}, status=status.HTTP_404_NOT_FOUND)
+
+    post_files = detach_files(post.pk, file_ids)
+    bump_post_caches(post.category)
+    # Listings do not show files
+    snapshot_exporter.schedule([post.pk])
+    return Response(post_files)
+
+
+@api_view(["POST"])
+@admin_access_required
+def bulk_posts(request):
+    """
+    Change the status, access or category of posts, or delete them, in bulk.
+
+    The posts are changed with a single UPDATE or DELETE statement in one
+    transaction, and the post caches are invalidated once for the batch.
+
+    Parameters:
+    - request: The HTTP request object.
+    - ids (body): The IDs of the posts.
+    - action (body): "update" or "delete".
+    - status, access, category (body): The new values, for updates.
+
+    Returns:
+    - The result of every post ID: "updated", "deleted" or "not_found".
+    - If the data is invalid, returns an error response.
+
+    HTTP Methods: POST
+    """
+    serializer = BulkPostSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    ids = list(dict.fromkeys(serializer.validated_data["ids"]))
+    action = serializer.validated_data["action"]
+    changes = BulkPostSerializer.changes(serializer.validated_data)
+
+    with transaction.atomic():
+        categories = dict(
+            select_for_update(Post.objects.filter(pk__in=ids)).values_list(
+                "id", "category"
+            )
+        )
+        found = list(categories)
+
+        if action == "delete":
+            changed = []
+            affected = set(
+                RelatedPost.objects.filter(related_id__in=found).values_list(
+                    "post_id", flat=True
+                )
+            ) - set(found)
+            Post.objects.filter(pk__in=found).delete()
+            unindex_posts(found)
+        else:
+            changed = found if "status" in changes else []
+            affected = []
+            Post.objects.filter(pk__in=found).update(
+                **changes, last_updated=timezone.now()
+            )
+
+    if found:
+        written = set(categories.values())
+        if "category" in changes:
+            written.add(changes["category"])
+        bump_post_caches(*written)
+        related_refresher.schedule(changed, affected)
+        snapshot_exporter.schedule(found, written)
+
+    result = "deleted" if action == "delete" else "updated"
+    return Response(
+        {
+            "results": [
+                {
+                    "id": post_id,
+                    "result": result if post_id in categories else "not_found",
+                }
+                for post_id in ids
+            ]
+        }
+    )
+
+
 @api_view(["POST"])
 def search_posts(request):
     """
@@ -142,12 +502,14 @@ def search_posts(request):
     Request Method: POST
 
     Request Body Parameters:
-        - keyword (string): The keyword to search for in post titles.
+        - keyword (string): The keyword to search for in post titles, excerpts, content and tags.
         - category (string): The category of posts to search in.
         - project_status (string): (Optional) The status of project posts to filter by.
         - technology (string): (Optional) The member technology to filter by.
         - page (integer): The page number for pagination.
         - limit (integer): The maximum number of results per page.
+        - cursor (string): (Optional) Switches to cursor pagination. Send null for the
+          first page and the returned 'next' token for the following pages.
 
     Returns:
         - Response with paginated list of matching post objects.
@@ -157,46 +519,215 @@ def search_posts(request):
         2. Create a search query based on the provided criteria.
         3. Perform a database query to retrieve posts matching the query.
         4. Apply pagination to the query results based on the page and limit.
-        5. Serialize the paginated posts data.
-        6. Return the paginated posts as a JSON response.
+        5. Fill in the author names of the paginated posts from the joined administrators.
+        6. Serialize the paginated posts data.
+        7. Return the paginated posts as a JSON response.
 
     Note:
         - The search query filters posts based on the keyword, category, and project status (if provided).
+        - Keywords are matched against the full-text index and results are ranked by relevance.
         - Posts are ordered by 'published' if the category is 'events', otherwise by 'event_date'.
         - The pagination is implemented using the 'page' and 'limit' parameters.
+        - In cursor mode pages are fetched by their sort key, without offsets or a count query,
+          and the response only holds the 'next' token and the results.
         - The response includes the paginated list of post objects.
+        - Responses for visitors are cached per request body until a post in the category is written.
+    """
+    if getattr(request.user, "user_type", None) == "administrator":
+        return find_posts(request)
+
+    category = request.data.get("category")
+    key = make_key(
+        "posts-search",
+        post_namespace(category),
+        {
+            "uri": request.build_absolute_uri(),
+            "keyword": (request.data.get("keyword") or "").strip().lower(),
+            "category": category,
+            "project_status": request.data.get("project_status"),
+            "access": request.data.get("access"),
+            "status": request.data.get("status"),
+            "limit": request.data.get("limit"),
+            "cursor": request.data.get("cursor", False),
+        },
+    )
+
+    data = get_cached(key)
+    if data is not None:
+        response = Response(data)
+        response["X-Cache"] = "HIT"
+        return response
+
+    response = find_posts(request)
+    if response.status_code == status.HTTP_200_OK:
+        set_cached(key, response.data, post_timeout(category))
+    response["X-Cache"] = "MISS"
+    return response
+
+
+def find_posts(request):
+    """
+    Run a post search and return the paginated response.
+
+    Parameters:
+    - request: The HTTP request object holding the search_posts body.
+
+    Returns:
+    - The paginated list of matching posts.
     """
     query = get_posts_query(request.data)
+    data = Post.objects.filter(**query)
+
+    keyword = request.data.get("keyword")
+    if keyword:
+        data = search_query(data, keyword)
 
     category = request.data.get("category")
     if category in ["events"]:
-         data = Post.objects.filter(**query).annotate(
-             past_due=Case(
-                 When(event_date__lt=timezone.now(), then=Value(1)),
-                 default=Value(0),
-                 output_field=IntegerField(),
-                 )).order_by('past_due', '-event_date')
+        data = data.annotate(
+            past_due=Case(
+                When(event_date__lt=timezone.now(), then=Value(1)),
+                default=Value(0),
+                output_field=IntegerField(),
+            )
+        )
+        ordering = ["past_due", "-event_date", "-id"]
     else:
-        data = Post.objects.filter(**query).order_by("-published")
+        ordering = ["-published", "-id"]
+
+    # Rank keyword matches by relevance, falling back to the category ordering
+    if keyword:
+        ordering = ["rank"] + ordering
+    data = only_serialized_fields(
+        data.select_related("created_by"),
+        AllPostsSerializer,
+        "created_by__first_name",
+        "created_by__last_name",
+    ).order_by(*ordering)
+
+    if "cursor" in request.data:
+        try:
+            paginator = KeysetPagination(ordering, request.data["limit"])
+            paginated_posts = paginator.paginate_queryset(
+                data, request.data.get("cursor")
+            )
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    else:
+        paginator = PageNumberPagination()
+        paginator.page_size = request.data["limit"]
+        paginated_posts = paginator.paginate_queryset(data, request)
 
-    for item in data:
-        author = Administrator.objects.get(pk=item.created_by_id)
-        item.author = f"{author.first_name} {author.last_name}"
+    set_authors(paginated_posts)
+    post_serializer = AllPostsSerializer(paginated_posts, many=True)
+
+    return paginator.get_paginated_response(post_serializer.data)
+
+
+@api_view(["GET"])
+def trending_posts(request):
+    """
+    Retrieve the public posts with the most recent views.
+
+    The ranking is precomputed from the hourly view counts with a time decay,
+    and the response is cached until the ranking is recomputed or a post is
+    written.
+
+    Returns:
+    - List of the trending posts with their score, highest first.
+    """
+    data = get_cached(trending_key())
+    if data is None:
+        ranking = trending_ranking()
+        scores = dict(ranking)
+        posts = only_serialized_fields(
+            Post.objects.public()
+            .filter(pk__in=list(scores))
+            .select_related("created_by"),
+            AllPostsSerializer,
+            "created_by__first_name",
+            "created_by__last_name",
+        )
+        posts = sorted(posts, key=lambda post: -scores[post.pk])
+        set_authors(posts)
+
+        data = [
+            {**post, "score": round(scores[post["id"]], 3)}
+            for post in AllPostsSerializer(posts, many=True).data
+        ]
+        # A stale ranking was recomputed under a new version
+        set_cached(trending_key(), data, post_timeout())
+    return Response(data)
+
+
+def trending_key():
+    return make_key(
+        "posts-trending", ALL_POSTS, {"ranking": get_version(TRENDING_NAMESPACE)}
+    )
+
+
+@api_view(["GET"])
+def tag_posts(request, slug):
+    """
+    Retrieve the public posts carrying a tag.
+
+    Parameters:
+    - slug: The slug of the tag.
+    - page (query): The page number for pagination.
+    - limit (query): (Optional) The maximum number of results per page.
+
+    Returns:
+    - Paginated list of the published public posts with the tag, newest first.
+    """
+    data = only_serialized_fields(
+        Post.objects.public().filter(post_tags__slug=slug).select_related("created_by"),
+        AllPostsSerializer,
+        "created_by__first_name",
+        "created_by__last_name",
+    ).order_by("-published", "-id")
 
     paginator = PageNumberPagination()
-    paginator.page_size = request.data["limit"]
+    paginator.page_size_query_param = "limit"
     paginated_posts = paginator.paginate_queryset(data, request)
+
+    set_authors(paginated_posts)
     post_serializer = AllPostsSerializer(paginated_posts, many=True)
 
     return paginator.get_paginated_response(post_serializer.data)
 
 
+@api_view(["GET"])
+def tag_cloud(request):
+    """
+    Retrieve the tags of public posts with the number of posts per tag.
+
+    Returns:
+    - List of tags with their slug, name and post count, most used first.
+    """
+    tags = (
+        PostTag.objects.filter(post__in=Post.objects.public())
+        .values("slug")
+        .annotate(name=Min("name"), count=Count("post"))
+        .order_by("-count", "slug")
+    )
+    return Response(list(tags))
+
+
+def set_authors(posts):
+    """
+    Fill in the author names of posts from their joined administrators.
+
+    Parameters:
+    - posts: The posts, fetched with select_related("created_by").
+    """
+    for post in posts:
+        if post.created_by:
+            post.author = f"{post.created_by.first_name} {post.created_by.last_name}"
+
+
 def get_posts_query(data):
     query = {}
 
-    if data["keyword"]:
-        query["title__contains"] = data["keyword"]
-
     if data["category"]:
         query["category"] = data["category"]
 
@@ -206,7 +737,7 @@ def get_posts_query(data):
     if data["access"]:
         query["access"] = data["access"]
         if data["access"] == "public":
-            query["published__lt"] = datetime.today()
+            query["published__lt"] = timezone.now()
 
     if data["status"]:
         query["status"] = data["status"]
@@ -0,0 +1,165 @@
+from functools import wraps
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from rest_framework.decorators import api_view
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework import status
+from api.models.post import Post
+from api.models.rsvp import RSVP
+from api.serializers.rsvp import RSVPSerializer
+from api.utils.projection import only_serialized_fields
+
+
+def admin_access_required(view_func):
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        user = request.user
+
+        if getattr(user, "role", None) in [
+            "super-admin",
+            "admin",
+            "content-admin",
+        ]:
+            return view_func(request, *args, **kwargs)
+        else:
+            return Response({"message": "Administrator is not authorized"}, status=403)
+
+    return _wrapped_view
+
+
+def open_events():
+    return Post.objects.filter(
+        category="events", status="published", event_date__gte=timezone.now()
+    )
+
+
+@api_view(["POST"])
+def create_rsvp(request, post_id):
+    """
+    Register an attendee for an event.
+
+    A seat is taken with a single conditional UPDATE of the attendee counter,
+    which only matches while the event is below its capacity, so concurrent
+    sign-ups can never overbook it or lose a count.
+
+    Parameters:
+    - request: The HTTP request object.
+    - post_id: The ID of the event post.
+    - name, email, phone_number (body): The attendee details, taken from the
+      profile of members.
+
+    Returns:
+    - If the registration succeeds, returns the registration.
+    - If the event is full, closed or the email is already registered, returns
+      an error response.
+
+    HTTP Methods: POST
+    """
+    data = request.data.copy()
+    member = None
+    if getattr(request.user, "user_type", None) == "member":
+        member = request.user
+        data["name"] = f"{member.first_name} {member.last_name}"
+        data["email"] = member.email
+        data.setdefault("phone_number", member.phone_number)
+
+    serializer = RSVPSerializer(data=data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        with transaction.atomic():
+            reserved = (
+                open_events()
+                .filter(pk=post_id)
+                .filter(Q(capacity__isnull=True) | Q(attendee_count__lt=F("capacity")))
+                .update(attendee_count=F("attendee_count") + 1)
+            )
+            if not reserved:
+                if open_events().filter(pk=post_id).exists():
+                    return Response(
+                        {"error": "Event is full."}, status=status.HTTP_409_CONFLICT
+                    )
+                return Response(
+                    {"error": "Event not found."}, status=status.HTTP_404_NOT_FOUND
+                )
+
+            serializer.save(post_id=post_id, member=member)
+    except IntegrityError:
+        return Response(
+            {"error": "Email is already registered."}, status=status.HTTP_409_CONFLICT
+        )
+
+    return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+@api_view(["POST"])
+def cancel_rsvp(request, post_id):
+    """
+    Cancel a registration for an event.
+
+    Parameters:
+    - request: The HTTP request object.
+    - post_id: The ID of the event post.
+    - email (body): The registered email, for administrators. Members cancel
+      their own registration.
+
+    Returns:
+    - If the registration exists, deletes it and returns a success response.
+    - If the registration does not exist, returns an error response.
+
+    HTTP Methods: POST
+    """
+    user_type = getattr(request.user, "user_type", None)
+    if user_type == "member":
+        rsvps = RSVP.objects.filter(post_id=post_id, member=request.user)
+    elif getattr(request.user, "role", None) in [
+        "super-admin",
+        "admin",
+        "content-admin",
+    ]:
+        rsvps = RSVP.objects.filter(post_id=post_id, email=request.data.get("email"))
+    else:
+        return Response({"message": "User is not authorized"}, status=403)
+
+    with transaction.atomic():
+        deleted, _ = rsvps.delete()
+        if not deleted:
+            return Response(
+                {"error": "Registration not found."}, status=status.HTTP_404_NOT_FOUND
+            )
+
+        Post.objects.filter(pk=post_id, attendee_count__gt=0).update(
+            attendee_count=F("attendee_count") - 1
+        )
+
+    return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+@api_view(["GET"])
+@admin_access_required
+def post_attendees(request, post_id):
+    """
+    Retrieve the attendees registered for an event.
+
+    Parameters:
+    - post_id: The ID of the event post.
+    - page (query): The page number for pagination.
+    - limit (query): (Optional) The maximum number of results per page.
+
+    Returns:
+    - Paginated list of the registrations, in sign-up order.
+    """
+    rsvps = only_serialized_fields(
+        RSVP.objects.filter(post_id=post_id), RSVPSerializer
+    ).order_by("created_at", "id")
+
+    paginator = PageNumberPagination()
+    paginator.page_size_query_param = "limit"
+    paginated_rsvps = paginator.paginate_queryset(rsvps, request)
+
+    serializer = RSVPSerializer(paginated_rsvps, many=True)
+    return paginator.get_paginated_response(serializer.data)
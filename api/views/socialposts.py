@@ -1,10 +1,23 @@
+from collections import defaultdict
 from functools import wraps
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework import status
+from api.models.comment import Comment
 from api.models.socialpost import SocialPost
-from api.models.member import Member
+from api.serializers.comment import CommentSerializer
 from api.serializers.socialpost import SocialPostSerializer
+from api.utils.authors import author_snapshot
+from api.utils.cache import bump_member_caches, get_cached, make_key
+from api.utils.cache import member_namespace, set_cached
+from api.utils.conditional import conditional_on_last_updated, last_updated_of
+from api.utils.events import events
+from api.utils.likes import liked_by
+from api.utils.pagination import KeysetPagination
+from api.utils.projection import only_serialized_fields
+from django.conf import settings
+from django.db.models import Count, F, Window
+from django.db.models.functions import RowNumber
 
 
 def admin_access_required(view_func):
@@ -34,6 +47,7 @@ def admin_access_required(view_func):
 
 
 @api_view(["GET"])
+@conditional_on_last_updated(last_updated_of(SocialPost), "socialpost_id")
 def get_socialpost(request, socialpost_id):
     """
     Retrieve details of a socialpost by their socialpost ID.
@@ -48,11 +62,6 @@ def get_socialpost(request, socialpost_id):
     try:
         socialpost = SocialPost.objects.get(pk=socialpost_id)
 
-        member = Member.objects.get(pk=socialpost.created_by_id)
-        socialpost.author = f"{member.first_name} {member.last_name}"
-        socialpost.company = member.company
-        socialpost.logo = member.logo
-
         serializer = SocialPostSerializer(socialpost)
         return Response(serializer.data)
     except SocialPost.DoesNotExist:
@@ -62,21 +71,120 @@ def get_socialpost(request, socialpost_id):
 @api_view(["GET"])
 def get_socialposts(request):
     """
-    Retrieve all socialposts.
+    Retrieve the active socialposts, newest first, a page at a time.
+
+    Parameters:
+    - cursor (query): (Optional) The "next" token of the previous page.
+    - since (query): (Optional) A "newer" token, to only fetch the socialposts
+      added since it was issued.
+    - limit (query): (Optional) The maximum number of results per page.
+    - comments (query): (Optional) Embed the comment count and this many of
+      the latest comments in every socialpost, 0 for the count only.
 
     Returns:
-    - Serialized data for all socialposts.
+    - The page of socialposts with the "next" token of the following page, the
+      "newer" token to poll for new socialposts with, and whether more newer
+      socialposts are waiting ("has_more"). Every socialpost tells whether the
+      authenticated member liked it ("liked").
+    - If a token is invalid, returns an error response.
     """
-    socialposts = SocialPost.objects.filter(status="active").order_by("-created_at")
+    try:
+        limit = min(
+            int(request.query_params.get("limit", settings.SOCIALPOSTS_PAGE_SIZE)),
+            settings.SOCIALPOSTS_MAX_PAGE_SIZE,
+        )
+        comments = request.query_params.get("comments")
+        if comments is not None:
+            comments = min(max(int(comments), 0), settings.SOCIALPOST_COMMENTS_MAX)
+    except ValueError:
+        return Response(
+            {"error": "Invalid limit or comments."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
 
-    for socialpost in socialposts:
-        member = Member.objects.get(pk=socialpost.created_by_id)
-        socialpost.author = f"{member.first_name} {member.last_name}"
-        socialpost.company = member.company
-        socialpost.logo = member.logo
+    socialposts = only_serialized_fields(
+        SocialPost.objects.filter(status="active"), SocialPostSerializer
+    )
+    paginator = KeysetPagination(["-created_at", "-id"], max(limit, 1))
+
+    try:
+        if request.query_params.get("since"):
+            socialposts = paginator.paginate_newer(
+                socialposts, request.query_params["since"]
+            )
+        else:
+            socialposts = paginator.paginate_queryset(
+                socialposts, request.query_params.get("cursor")
+            )
+    except ValueError as error:
+        return Response({"error": str(error)}, status=status.HTTP_400_BAD_REQUEST)
 
     serializer = SocialPostSerializer(socialposts, many=True)
-    return Response(serializer.data)
+    data = serializer.data
+    if comments is not None:
+        embed_comments(data, comments)
+
+    # Members see which socialposts of the page they liked
+    liked = liked_by(request.user, [socialpost["id"] for socialpost in data])
+    for socialpost in data:
+        socialpost["liked"] = socialpost["id"] in liked
+
+    return Response(
+        {
+            "next": paginator.next_cursor,
+            "newer": paginator.newer_cursor,
+            "has_more": paginator.has_more,
+            "results": data,
+        }
+    )
+
+
+def embed_comments(socialposts, latest):
+    """
+    Add the comment count and the latest comments to serialized socialposts.
+
+    The counts of the whole page come from one grouped query and the latest
+    comments from one query ranking the comments of every socialpost with a
+    window function.
+
+    Parameters:
+    - socialposts: The serialized socialposts.
+    - latest: The number of latest comments to embed per socialpost.
+    """
+    ids = [socialpost["id"] for socialpost in socialposts]
+    if not ids:
+        return
+
+    counts = dict(
+        Comment.objects.filter(socialpost__in=ids)
+        .order_by()
+        .values("socialpost")
+        .annotate(count=Count("id"))
+        .values_list("socialpost", "count")
+    )
+
+    comments = defaultdict(list)
+    if latest:
+        rows = (
+            only_serialized_fields(
+                Comment.objects.filter(socialpost__in=ids), CommentSerializer
+            )
+            .annotate(
+                rank=Window(
+                    RowNumber(),
+                    partition_by=[F("socialpost")],
+                    order_by=[F("created_at").desc(), F("id").desc()],
+                )
+            )
+            .filter(rank__lte=latest)
+            .order_by("socialpost", "rank")
+        )
+        for comment in CommentSerializer(rows, many=True).data:
+            comments[comment["socialpost"]].append(comment)
+
+    for socialpost in socialposts:
+        socialpost["comment_count"] = counts.get(socialpost["id"], 0)
+        socialpost["comments"] = comments[socialpost["id"]]
 
 
 @api_view(["POST"])
@@ -103,7 +211,9 @@ def create_socialpost(request):
 
     serializer = SocialPostSerializer(data=request.data)
     if serializer.is_valid():
-        serializer.save()
+        serializer.save(**author_snapshot(request.user, SocialPost))
+        bump_member_caches(request.user.id)
+        events.publish("socialpost", serializer.data)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -150,9 +260,12 @@ def update_socialpost(request, socialpost_id):
             {"error": "socialpost not found."}, status=status.HTTP_404_NOT_FOUND
         )
 
-    serializer = SocialPostSerializer(socialpost, data=request.data)
+    author_id = socialpost.created_by_id
+    serializer = SocialPostSerializer(socialpost, data=request.data, partial=True)
     if serializer.is_valid():
         serializer.save()
+        if serializer.changed_fields:
+            bump_member_caches(author_id, socialpost.created_by_id)
         return Response(serializer.data)
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -200,26 +313,59 @@ def delete_socialpost(request, socialpost_id):
         )
 
     socialpost.delete()
+    bump_member_caches(socialpost.created_by_id)
     return Response(status=status.HTTP_204_NO_CONTENT)
 
 
 @api_view(["GET"])
 def member_socialposts(request, member_id):
     """
-    Retrieve all member socialposts.
+    Retrieve the socialposts of a member, newest first, a page at a time.
+
+    Pages are cached until the member writes a socialpost, one of their
+    socialposts is liked or their author details change.
+
+    Parameters:
+    - member_id: The ID of the member.
+    - cursor (query): (Optional) The "next" token of the previous page.
+    - limit (query): (Optional) The maximum number of results per page.
 
     Returns:
-    - Serialized data for all socialposts for a single member.
+    - The page of socialposts with the "next" token of the following page.
+    - If the cursor is invalid, returns an error response.
     """
-    socialposts = SocialPost.objects.filter(created_by=member_id).order_by(
-        "-created_at"
+    try:
+        limit = min(
+            int(request.query_params.get("limit", settings.SOCIALPOSTS_PAGE_SIZE)),
+            settings.SOCIALPOSTS_MAX_PAGE_SIZE,
+        )
+    except ValueError:
+        return Response({"error": "Invalid limit."}, status=status.HTTP_400_BAD_REQUEST)
+
+    cursor = request.query_params.get("cursor")
+    key = make_key(
+        "member-socialposts",
+        member_namespace(member_id),
+        {"member": member_id, "cursor": cursor, "limit": limit},
     )
 
-    for socialpost in socialposts:
-        member = Member.objects.get(pk=socialpost.created_by_id)
-        socialpost.author = f"{member.first_name} {member.last_name}"
-        socialpost.company = member.company
-        socialpost.logo = member.logo
+    data = get_cached(key)
+    if data is not None:
+        response = Response(data)
+        response["X-Cache"] = "HIT"
+        return response
+
+    socialposts = only_serialized_fields(
+        SocialPost.objects.filter(created_by=member_id), SocialPostSerializer
+    )
+    paginator = KeysetPagination(["-created_at", "-id"], max(limit, 1))
+    try:
+        socialposts = paginator.paginate_queryset(socialposts, cursor)
+    except ValueError as error:
+        return Response({"error": str(error)}, status=status.HTTP_400_BAD_REQUEST)
 
     serializer = SocialPostSerializer(socialposts, many=True)
-    return Response(serializer.data)
+    response = paginator.get_paginated_response(serializer.data)
+    set_cached(key, response.data)
+    response["X-Cache"] = "MISS"
+    return response
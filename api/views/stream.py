@@ -0,0 +1,99 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponseNotAllowed, JsonResponse, StreamingHttpResponse
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from api.utils.authentication import UserJWTAuthentication
+from api.utils.events import events, format_event
+
+
+def authenticate_stream(request):
+    """
+    Authenticate a stream request from its Authorization header, or from the
+    token query parameter since browsers' EventSource cannot send headers.
+
+    Parameters:
+    - request: The HTTP request object.
+
+    Returns:
+    - The authenticated user, or None.
+    """
+    authentication = UserJWTAuthentication()
+    try:
+        token = request.GET.get("token")
+        if token:
+            return authentication.get_user(authentication.get_validated_token(token))
+
+        result = authentication.authenticate(request)
+        return result[0] if result else None
+    except AuthenticationFailed:
+        return None
+
+
+async def event_stream():
+    subscription = events.subscribe()
+    # Streams are ended after a while so those of clients that went away are
+    # released, live clients reconnect on their own
+    deadline = subscription.loop.time() + settings.SSE_MAX_DURATION
+    try:
+        yield f"retry: {settings.SSE_RETRY}\n\n"
+        while True:
+            remaining = deadline - subscription.loop.time()
+            if remaining <= 0:
+                return
+
+            try:
+                event = await subscription.get(
+                    min(settings.SSE_HEARTBEAT_INTERVAL, remaining)
+                )
+            except asyncio.TimeoutError:
+                # Keep idle connections open through proxies
+                yield ": heartbeat\n\n"
+                continue
+
+            if event is None:
+                return
+            yield format_event(event)
+    finally:
+        events.unsubscribe(subscription)
+
+
+async def socialposts_stream(request):
+    """
+    Stream new socialposts and comments to a member as server-sent events.
+
+    Every connection waits on its own bounded queue without touching the
+    database, and receives a heartbeat comment when idle. A connection that
+    falls behind or stays open for SSE_MAX_DURATION seconds is closed, the
+    client reconnects and catches up with the "newer" token of the feed.
+    Only served under ASGI (api.asgi.application), a WSGI server would hold
+    a worker and buffer the whole stream.
+
+    Parameters:
+    - token (query): (Optional) The access token, when no Authorization header
+      can be sent.
+
+    Returns:
+    - A text/event-stream of "socialpost" and "comment" events holding the
+      serialized objects.
+    - If the user is not a member, or the server is not running under ASGI,
+      returns an error response.
+    """
+    if request.method != "GET":
+        return HttpResponseNotAllowed(["GET"])
+
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {"message": "Streaming requires an ASGI server."}, status=501
+        )
+
+    user = await sync_to_async(authenticate_stream)(request)
+    if getattr(user, "user_type", None) != "member":
+        return JsonResponse({"message": "User is not authorized"}, status=403)
+
+    response = StreamingHttpResponse(event_stream(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
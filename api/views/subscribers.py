@@ -6,6 +6,7 @@ from rest_framework.decorators import api_view
 from api.models.subscriber import Subscriber
 from api.serializers.subscriber import SubscriberSerializer
 from api.utils.email import send_email
+from api.utils.projection import only_serialized_fields
 
 
 def admin_access_required(view_func):
@@ -42,7 +43,7 @@ def get_subscribers(request):
     ]:
         return Response({"message": "Administrator is not authorized"}, status=403)
 
-    subscribers = Subscriber.objects.all()
+    subscribers = only_serialized_fields(Subscriber.objects.all(), SubscriberSerializer)
 
     serializer = SubscriberSerializer(subscribers, many=True)
     return Response(serializer.data)